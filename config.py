@@ -51,7 +51,9 @@ BROWSER_TIMEOUT = int(os.getenv('BROWSER_TIMEOUT', 60000))  # 60 seconds
 # Guard portal URL
 GUARD_LOGIN_URL = os.getenv('GUARD_LOGIN_URL', 'https://gigezrate.guard.com/auth')
 
-# Max concurrent workers
+# Worker threads pulling tasks off the queue. Browser automation itself runs
+# one task at a time (webhook_server.browser_lock) - all tasks share one
+# persistent browser profile.
 MAX_WORKERS = int(os.getenv('MAX_WORKERS', 3))
 
 # Trace settings
@@ -70,6 +72,10 @@ COVERSHEET_WEBHOOK_URL = os.getenv(
     'https://carrier-submission-tracker-system-for-insurance-production.up.railway.app/api/webhooks/rpa-complete'
 ).strip()
 
+# Send callbacks that finish close together as one {"events": [...]} POST
+# (only enable if the Coversheet endpoint accepts that shape)
+COVERSHEET_WEBHOOK_BATCH = os.getenv('COVERSHEET_WEBHOOK_BATCH', 'false').lower() == 'true'
+
 print(f"Guard Automation Config Loaded:")
 print(f"  - Base Directory: {BASE_DIR}")
 print(f"  - Logs: {LOG_DIR}")
@@ -0,0 +1,716 @@
+"""
+GUARD CLI CLIENT
+================
+Shared client code for the Guard automation test scripts.
+
+GuardClient talks to one webhook server (health, send, monitor, traces);
+run_menu drives the interactive full-automation test. The scripts
+test_full_automation.py and test_full_automation_local.py only choose the
+server URL and call into this module.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Short-lived on-disk cache for the health check, so re-running the script
+# within a few seconds skips that round-trip
+CACHE_DIR = Path.home() / ".guard_cache"
+HEALTH_CACHE_TTL = 10  # seconds
+
+# Downloaded trace zips, streamed to disk in 64 KiB chunks
+TRACES_DIR = Path(__file__).parent / "traces"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Console banner lines
+SEPARATOR = "=" * 80
+THIN_SEPARATOR = "-" * 60
+
+# Request bodies larger than this are gzip-compressed before sending
+# (below it the gzip header overhead outweighs the savings)
+GZIP_MIN_BYTES = 512
+
+# Status polling backoff (used when the server's event stream is unavailable):
+# start fast, slow down while nothing changes, never wait longer than the cap
+POLL_INITIAL_DELAY = 1.0  # seconds
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_DELAY = 15  # seconds
+
+# Fields a supplied account_data must carry to create an account - checked
+# before sending so an incomplete one fails here instead of mid-automation
+# (with no account_data at all the server uses its default account)
+REQUIRED_ACCOUNT_FIELDS = (
+    ("applicant_name",),
+    ("state",),
+    ("zipcode",),
+    ("contact_phone", "area"),
+    ("contact_phone", "prefix"),
+    ("contact_phone", "suffix"),
+)
+
+# ============================================================================
+# FULL AUTOMATION DATA - Everything needed for Account + Quote
+# ============================================================================
+
+def new_task_suffix() -> str:
+    """Unique task ID suffix - nanosecond timestamp (hex) plus 2 random bytes"""
+    return f"{time.time_ns():x}{os.urandom(2).hex()}"
+
+
+def get_full_automation_data(task_prefix: str = "full_auto"):
+    """
+    Returns complete data for full automation (account creation + quote)
+    This is exactly what the Online Quoting Coversheet will send.
+    
+    SIMPLIFIED PAYLOAD - Only user-provided fields!
+    The following are HARDCODED on the server:
+    - website, producer_id, csr_id, policy_inception (auto +2 days)
+    - headquarters_state (copied from state), industry_id, sub_industry_id
+    - business_type_id, lines_of_business
+    """
+    
+    return {
+        # ====================================================================
+        # ACTION & TASK
+        # ====================================================================
+        "action": "start_automation",
+        "task_id": f"{task_prefix}_{new_task_suffix()}",
+        
+        # ====================================================================
+        # CREATE ACCOUNT FLAG - Set to True for full flow
+        # ====================================================================
+        "create_account": True,
+        
+        # ====================================================================
+        # ACCOUNT CREATION DATA - SIMPLIFIED! (Only 14 fields from user)
+        # ====================================================================
+        "account_data": {
+            # Business Entity Information
+            "legal_entity": "L",  # L=LLC, C=Corporation, P=Partnership, I=Individual, J=Joint Venture
+            "applicant_name": "BISMILLAH GAS STATION LLC",
+            "dba": "Bismillah Gas & Convenience",
+            
+            # Business Address
+            "address1": "280 Griffin St",
+            "address2": "Suite 100",
+            "zipcode": "30253-3100",
+            "city": "McDonough",
+            "state": "GA",
+            
+            # Contact Information
+            "contact_name": "Ahmed Khan",
+            "contact_phone": {
+                "area": "404",
+                "prefix": "555",
+                "suffix": "1234"
+            },
+            "email": "rohitjagwani587@gmail.com",
+            
+            # Business Details
+            "years_in_business": "5",
+            "description": "Gas station with convenience store, selling fuel, snacks, beverages, and tobacco products",
+            
+            # Property Ownership
+            "ownership_type": "tenant"  # "tenant" or "owner"
+            
+            # ============================================================
+            # THESE ARE NOW HARDCODED ON SERVER - NO NEED TO SEND:
+            # ============================================================
+            # "website": ""                  -> Hardcoded to ""
+            # "producer_id": "2774846"       -> Hardcoded
+            # "csr_id": "16977940"           -> Hardcoded
+            # "policy_inception": "..."      -> Auto-calculated (today + 2 days)
+            # "headquarters_state": "GA"     -> Copied from state
+            # "industry_id": "11"            -> Hardcoded (Gas Station)
+            # "sub_industry_id": "45"        -> Hardcoded
+            # "business_type_id": "127"      -> Hardcoded
+            # "lines_of_business": ["CB"]    -> Hardcoded (Commercial Business)
+        },
+        
+        # ====================================================================
+        # QUOTE DATA - Filled after account is created
+        # ====================================================================
+        "quote_data": {
+            # Revenue Information
+            "combined_sales": "1200000",      # Total Annual Sales ($1,200,000)
+            "gas_gallons": "750000",          # Annual Gallons of Gasoline (750,000)
+            
+            # Building Information
+            "year_built": "2005",             # Year Building Was Built
+            "square_footage": "4500",         # Total Square Footage
+            "mpds": "8"                       # Number of Gas Pumps (Multi-Product Dispensers)
+            
+            # Optional:
+            # "employees": "5"                # Default is "3" if not sent
+        }
+    }
+
+
+def get_sample_data_2(task_prefix: str = "full_auto"):
+    """Alternative sample data for testing - SIMPLIFIED PAYLOAD"""
+    
+    return {
+        "action": "start_automation",
+        "task_id": f"{task_prefix}_{new_task_suffix()}",
+        "create_account": True,
+        
+        # SIMPLIFIED - Only required fields from user
+        "account_data": {
+            "legal_entity": "C",  # Corporation
+            "applicant_name": "QUICK STOP FUEL INC",
+            "dba": "Quick Stop Gas & Go",
+            "address1": "280 Griffin St",
+            "address2": "",
+            "zipcode": "30253-3100",
+            "city": "McDonough",
+            "state": "GA",
+            "contact_name": "Michael Johnson",
+            "contact_phone": {
+                "area": "770",
+                "prefix": "466",
+                "suffix": "5678"
+            },
+            "email": "mikequickstopfuel@gmail.com",
+            "years_in_business": "8",
+            "description": "High-volume gas station with full-service convenience store",
+            "ownership_type": "owner"
+            # All other fields are hardcoded on server!
+        },
+        
+        "quote_data": {
+            "combined_sales": "2500000",
+            "gas_gallons": "1200000",
+            "year_built": "2010",
+            "square_footage": "6000",
+            "mpds": "12"
+        }
+    }
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def create_session():
+    """
+    requests.Session with a pooled, retrying adapter
+    Every call - including concurrent task monitors - reuses its keep-alive
+    connections instead of opening a new TCP/TLS connection per request
+    """
+    # requests is imported here rather than at module level to keep import cheap
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    # Retry only idempotent requests (GET) on gateway errors - never re-send the webhook POST
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def safe_int(value) -> int:
+    """Parse a numeric form value for display - returns 0 instead of raising on bad input"""
+    text = str(value).strip() if value is not None else ""
+    return int(text) if text.removeprefix("-").isdecimal() else 0
+
+
+def validate_payload(data: dict) -> list:
+    """Return the account_data fields missing from the payload (empty if valid)"""
+    account = data.get("account_data")
+    # Same fallback as the server: no account_data means the default account
+    if not data.get("create_account") or not account:
+        return []
+    
+    missing = []
+    for path in REQUIRED_ACCOUNT_FIELDS:
+        value = account
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if not value:
+            missing.append("account_data." + ".".join(path))
+    return missing
+
+
+@dataclass(slots=True)
+class QuoteData:
+    """Quote fields of a payload, with the numeric ones parsed once for display"""
+    combined_sales: int
+    gas_gallons: int
+    square_footage: int
+    year_built: str
+    mpds: str
+    employees: str = None
+
+    @classmethod
+    def from_payload(cls, quote: dict) -> "QuoteData":
+        return cls(
+            combined_sales=safe_int(quote.get('combined_sales')),
+            gas_gallons=safe_int(quote.get('gas_gallons')),
+            square_footage=safe_int(quote.get('square_footage')),
+            year_built=quote.get('year_built', 'N/A'),
+            mpds=quote.get('mpds', 'N/A'),
+            employees=quote.get('employees'),
+        )
+
+
+class GuardClient:
+    """Client for one Guard webhook server"""
+
+    def __init__(self, base_url: str, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.session = session if session is not None else create_session()
+
+    def cached_get_json(self, path: str, ttl: int, timeout: int = 15):
+        """
+        GET a JSON endpoint through the on-disk TTL cache (CACHE_DIR)
+        Returns (status_code, data) - only 200 responses are cached
+        """
+        url = f"{self.base_url}{path}"
+        cache_file = CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+        try:
+            cached = json.loads(cache_file.read_text())
+            if cached["expires_at"] > time.time():
+                return 200, cached["data"]
+        except (OSError, ValueError, KeyError):
+            pass  # Missing, unreadable or stale entry - fetch fresh
+        
+        response = self.session.get(url, timeout=timeout)
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        # Responses are parsed straight from the raw bytes (json.loads detects UTF-8),
+        # skipping the str decode that response.json() does first
+        data = json.loads(response.content)
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            cache_file.write_text(json.dumps({"expires_at": time.time() + ttl, "data": data}))
+        except OSError:
+            pass  # Caching is best-effort
+        return 200, data
+
+    def health(self) -> bool:
+        """Check if server is running"""
+        import requests
+        
+        print(f"\n[SERVER] {self.base_url}")
+        print(f"[CHECK] Testing server health...")
+        
+        try:
+            status_code, data = self.cached_get_json("/health", HEALTH_CACHE_TTL)
+            if status_code == 200:
+                print(
+                    f"\n✅ Server is HEALTHY!\n"
+                    f"   Service: {data.get('service', 'N/A')}\n"
+                    f"   Workers: {data.get('active_workers', 0)}/{data.get('max_workers', 3)}\n"
+                    f"   Queue: {data.get('queue_size', 0)}"
+                )
+                return True
+            else:
+                print(f"\n❌ Server returned: {status_code}")
+                return False
+        except requests.exceptions.ConnectionError:
+            print(f"\n❌ Could not connect to server!")
+            print(f"   Make sure the server is running at {self.base_url}")
+            return False
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+            return False
+
+    def send(self, data: dict):
+        """Send full automation request to server - returns the task ID if accepted"""
+        # Display account data
+        account = data.get("account_data", {})
+        quote = QuoteData.from_payload(data.get("quote_data", {}))
+        phone = account.get('contact_phone', {})
+        
+        # Build the whole summary first and write it in one go
+        lines = [
+            "\n" + SEPARATOR,
+            "📤 SENDING FULL AUTOMATION REQUEST",
+            SEPARATOR,
+            "\n📋 ACCOUNT CREATION DATA:",
+            f"   Business Name: {account.get('applicant_name', 'N/A')}",
+            f"   DBA: {account.get('dba', 'N/A')}",
+            f"   Legal Entity: {account.get('legal_entity', 'N/A')}",
+            f"   Address: {account.get('address1', '')}, {account.get('city', '')}, {account.get('state', '')} {account.get('zipcode', '')}",
+            f"   Contact: {account.get('contact_name', 'N/A')}",
+            f"   Phone: ({phone.get('area', '')}) {phone.get('prefix', '')}-{phone.get('suffix', '')}",
+            f"   Email: {account.get('email', 'N/A')}",
+            f"   Years in Business: {account.get('years_in_business', 'N/A')}",
+            f"   Ownership: {account.get('ownership_type', 'N/A')}",
+            "\n💰 QUOTE DATA:",
+            f"   Combined Sales: ${quote.combined_sales:,}",
+            f"   Gas Gallons: {quote.gas_gallons:,}",
+            f"   Year Built: {quote.year_built}",
+            f"   Square Footage: {quote.square_footage:,} sq ft",
+            f"   Gas Pumps (MPDs): {quote.mpds}",
+        ]
+        if quote.employees:
+            lines.append(f"   Employees: {quote.employees}")
+        print("\n".join(lines))
+        
+        missing = validate_payload(data)
+        if missing:
+            print(f"\n❌ Payload is missing required fields: {', '.join(missing)}")
+            return None
+        
+        print(f"\n🚀 Sending request...")
+        
+        try:
+            # Encode once ourselves (compact separators) instead of letting requests re-encode json=
+            body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+            if len(body) > GZIP_MIN_BYTES:
+                body = gzip.compress(body)
+                headers["Content-Encoding"] = "gzip"
+            
+            response = self.session.post(
+                f"{self.base_url}/webhook",
+                data=body,
+                headers=headers,
+                timeout=30
+            )
+            result = json.loads(response.content)
+            
+            task_id = result.get("task_id")
+            status = result.get("status")
+            
+            print(f"\n📬 RESPONSE:")
+            print(f"   Status: {status}")
+            print(f"   Task ID: {task_id}")
+            print(f"   Message: {result.get('message', 'N/A')}")
+            
+            if status == "accepted":
+                print(f"\n✅ Request accepted! Full automation started.")
+                return task_id
+            else:
+                print(f"\n❌ Request not accepted: {result}")
+                return None
+        
+        except Exception as e:
+            print(f"\n❌ Error sending request: {e}")
+            return None
+
+    def poll_status(self, task_id: str, start_time: float, max_wait: int, tag: str = ""):
+        """
+        Yield the task status every time it changes, polling /task/<id>/status
+        with capped exponential backoff (1s, 1.5s, 2.25s ... up to 15s), reset on every change
+        """
+        status_url = f"{self.base_url}/task/{task_id}/status"
+        last_version = None
+        delay = POLL_INITIAL_DELAY
+        
+        while time.time() - start_time < max_wait:
+            try:
+                # Server answers 204 (no body) while the status version is unchanged
+                params = {"since": last_version} if last_version else None
+                response = self.session.get(status_url, params=params, timeout=15)
+                if response.status_code == 200:
+                    last_version = response.headers.get("X-Status-Version")
+                    delay = POLL_INITIAL_DELAY  # Activity - poll quickly again
+                    yield json.loads(response.content)
+                elif response.status_code == 404:
+                    print(f"{tag}[{int(time.time() - start_time):4d}s] Task not found yet...")
+            
+            except Exception as e:
+                print(f"{tag}[WARN] Status check error: {e}")
+            
+            time.sleep(delay)
+            delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
+
+    def stream_status(self, task_id: str, start_time: float, max_wait: int, tag: str = ""):
+        """
+        Yield the task status every time it changes, pushed by the server's
+        /task/<id>/events stream (Server-Sent Events) over one long-lived connection
+        Falls back to polling if the server has no event stream or the stream drops
+        """
+        events_url = f"{self.base_url}/task/{task_id}/events"
+        
+        try:
+            # Read timeout > server heartbeat interval, so a quiet stream is not cut off
+            with self.session.get(events_url, stream=True, timeout=(15, 60)) as response:
+                if response.status_code == 200:
+                    for line in response.iter_lines():
+                        if line.startswith(b"data:"):
+                            yield json.loads(line[5:])
+                        if time.time() - start_time >= max_wait:
+                            return
+        except Exception as e:
+            print(f"{tag}[WARN] Event stream error: {e} - falling back to polling")
+        
+        yield from self.poll_status(task_id, start_time, max_wait, tag)
+
+    def monitor(self, task_id: str, max_wait: int = 600, show_task_id: bool = False) -> bool:
+        """
+        Monitor task until completion (default 10 minutes timeout)
+        show_task_id prefixes status lines with the task ID (used when monitoring several tasks at once)
+        """
+        tag = f"{task_id} " if show_task_id else ""
+        print("\n".join([
+            "\n" + SEPARATOR,
+            f"📊 MONITORING TASK: {task_id}",
+            SEPARATOR,
+            "\n⏳ This may take 5-10 minutes for full automation...",
+            "   (Account creation + all quote panels)\n\n",
+        ]), end="")
+        
+        start_time = time.time()
+        last_status = None
+        last_message = None
+        
+        for status_data in self.stream_status(task_id, start_time, max_wait, tag):
+            current_status = status_data.get('status', 'unknown')
+            current_message = status_data.get('message', '')
+            elapsed = int(time.time() - start_time)
+            
+            # Print status updates - every line tagged and written in one call
+            # (newline included - print() writes end separately), so concurrent
+            # monitors (monitor_many) can't interleave within a block
+            if current_status != last_status or current_message != last_message:
+                lines = [f"[{elapsed:4d}s] Status: {current_status.upper()}"]
+                if status_data.get('queue_position'):
+                    lines.append(f"        Queue Position: {status_data['queue_position']}")
+                if status_data.get('policy_code'):
+                    lines.append(f"        Policy Code: {status_data['policy_code']}")
+                if current_message and current_message != last_message:
+                    lines.append(f"        Message: {current_message}")
+                if status_data.get('quotation_url'):
+                    lines.append(f"        Quote URL: {status_data['quotation_url']}")
+                print("".join(f"{tag}{line}\n" for line in lines), end="")
+                
+                last_status = current_status
+                last_message = current_message
+            
+            # Check for completion
+            if current_status in ['completed', 'success']:
+                lines = ["\n" + SEPARATOR, f"🎉 {tag}SUCCESS! FULL AUTOMATION COMPLETED!", SEPARATOR]
+                if status_data.get('policy_code'):
+                    lines.append(f"\n📋 {tag}Policy Code: {status_data['policy_code']}")
+                if status_data.get('quotation_url'):
+                    lines.append(f"🔗 {tag}Quote URL: {status_data['quotation_url']}")
+                if status_data.get('message'):
+                    lines.append(f"📝 {tag}Message: {status_data['message']}")
+                print("\n".join(lines) + "\n", end="")
+                
+                return True
+            
+            # Check for failure
+            elif current_status in ['failed', 'error']:
+                lines = ["\n" + SEPARATOR, f"❌ {tag}AUTOMATION FAILED", SEPARATOR]
+                if status_data.get('error'):
+                    lines.append(f"\n🔴 {tag}Error: {status_data['error']}")
+                if status_data.get('traceback'):
+                    lines.append(f"\n📜 {tag}Traceback:\n{status_data['traceback'][:500]}...")
+                print("\n".join(lines) + "\n", end="")
+                
+                return False
+        
+        print(f"\n⏰ {tag}TIMEOUT: Task did not complete within {max_wait} seconds")
+        return False
+
+    def monitor_many(self, task_ids: list, max_wait: int = 600) -> dict:
+        """
+        Monitor several tasks concurrently - one thread per task. The server
+        still runs tasks one at a time, so this only saves client-side polling
+        overhead, not wall time: max_wait must cover every task queued ahead
+        of the last one, so callers should scale it by len(task_ids)
+        Returns {task_id: success}
+        """
+        with ThreadPoolExecutor(max_workers=len(task_ids)) as executor:
+            futures = {
+                task_id: executor.submit(self.monitor, task_id, max_wait, True)
+                for task_id in task_ids
+            }
+            return {task_id: future.result() for task_id, future in futures.items()}
+
+    def list_traces(self):
+        """List available traces"""
+        print("\n" + THIN_SEPARATOR)
+        print("📁 AVAILABLE TRACES:")
+        print(THIN_SEPARATOR)
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/traces",
+                headers={"Accept": "application/json"},
+                timeout=10
+            )
+            if response.status_code == 200:
+                data = json.loads(response.content)
+                traces = data.get("traces", [])
+                
+                if traces:
+                    for t in traces[:5]:
+                        print(f"   • {t['task_id']} ({t['size_kb']} KB) - {t['created_at'][:19]}")
+                else:
+                    print("   No traces available")
+            else:
+                print(f"   Could not fetch traces: {response.status_code}")
+        except Exception as e:
+            print(f"   Error: {e}")
+
+    def download_trace(self, task_id: str, traces_dir: Path = TRACES_DIR):
+        """
+        Stream a task's trace zip to traces_dir/<task_id>.zip
+        A copy already on disk is revalidated (If-Modified-Since) rather than downloaded again
+        Returns the saved path, or None if the server has no trace for the task
+        """
+        trace_path = traces_dir / f"{task_id}.zip"
+        headers = {}
+        if trace_path.exists():
+            headers["If-Modified-Since"] = formatdate(trace_path.stat().st_mtime, usegmt=True)
+        
+        with self.session.get(f"{self.base_url}/trace/{task_id}", headers=headers, stream=True, timeout=60) as response:
+            if response.status_code == 304:
+                return trace_path  # Local copy is current
+            if response.status_code != 200:
+                return None
+            trace_path.parent.mkdir(exist_ok=True)
+            response.raw.decode_content = True
+            # Download next to the target and swap it in only once complete - a
+            # partial zip left at trace_path would be revalidated as current forever
+            with tempfile.NamedTemporaryFile(dir=trace_path.parent, suffix=".part", delete=False) as f:
+                try:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                except BaseException:
+                    f.close()
+                    os.unlink(f.name)
+                    raise
+            last_modified = response.headers.get("Last-Modified")
+            if last_modified:
+                # Revalidate against the server's time, not our download time
+                with suppress(TypeError, ValueError):
+                    mtime = parsedate_to_datetime(last_modified).timestamp()
+                    os.utime(f.name, (mtime, mtime))
+            os.replace(f.name, trace_path)
+            return trace_path
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def run_batch(client: GuardClient, datasets: list):
+    """Send several automation requests, then monitor all of them concurrently"""
+    task_ids = [task_id for task_id in map(client.send, datasets) if task_id]
+    
+    if task_ids:
+        # Tasks share one browser and run one after another, so allow for all of them
+        results = client.monitor_many(task_ids, max_wait=600 * len(task_ids))
+        
+        # Show traces
+        client.list_traces()
+        
+        print("\n" + SEPARATOR)
+        print("BATCH RESULTS")
+        print(SEPARATOR)
+        for task_id, success in results.items():
+            print(f"   {'✅' if success else '❌'} {task_id}")
+    
+    print("\n" + SEPARATOR)
+    print("DONE")
+    print(SEPARATOR)
+
+
+# Data set menu, joined once at import and written with a single print
+MENU = "\n".join([
+    "\n" + SEPARATOR,
+    "SELECT DATA SET TO USE:",
+    SEPARATOR,
+    "\n1. BISMILLAH GAS STATION LLC",
+    "   - Combined Sales: $1,200,000",
+    "   - Gas Gallons: 750,000",
+    "   - 8 Pumps, 4,500 sq ft",
+    "",
+    "2. QUICK STOP FUEL INC",
+    "   - Combined Sales: $2,500,000",
+    "   - Gas Gallons: 1,200,000",
+    "   - 12 Pumps, 6,000 sq ft",
+    "",
+    "3. BOTH (submit together, monitor concurrently)",
+    "",
+    "4. Exit",
+])
+
+
+def run_menu(client: GuardClient, title: str = "GUARD FULL AUTOMATION TEST", task_prefix: str = "full_auto"):
+    """Interactive full-automation test against the client's server"""
+    
+    # Check server health
+    print(f"\n{SEPARATOR}\n🛡️  {title}\n{SEPARATOR}")
+    if not client.health():
+        print("\n❌ Server not available.")
+        print("   Start local server: python webhook_server.py")
+        sys.exit(1)
+    
+    # Show menu
+    print(MENU)
+    
+    choice = input("\nEnter choice (1-4): ").strip()
+    
+    if choice == "1":
+        data = get_full_automation_data(task_prefix)
+    elif choice == "2":
+        data = get_sample_data_2(task_prefix)
+    elif choice == "3":
+        run_batch(client, [get_full_automation_data(task_prefix), get_sample_data_2(task_prefix)])
+        return
+    elif choice == "4":
+        print("\n👋 Goodbye!")
+        sys.exit(0)
+    else:
+        print("\n❌ Invalid choice")
+        sys.exit(1)
+    
+    # Send full automation request
+    task_id = client.send(data)
+    
+    if task_id:
+        # Ask to monitor
+        print("\n" + THIN_SEPARATOR)
+        monitor = input("Monitor task progress? (y/n): ").strip().lower()
+        
+        if monitor == 'y':
+            success = client.monitor(task_id)
+            
+            # Show traces
+            client.list_traces()
+            
+            if success:
+                print("\n✅ Full automation completed successfully!")
+            else:
+                print("\n❌ Automation did not complete successfully")
+        else:
+            print(f"\n📋 Task ID: {task_id}")
+            print(f"   Check status: {client.base_url}/task/{task_id}/status")
+            print(f"   View traces: {client.base_url}/traces")
+    
+    print("\n" + SEPARATOR)
+    print("DONE")
+    print(SEPARATOR)
@@ -30,6 +30,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Verification code patterns (compiled once, reused for every email)
+# Guard format: "Your Agency Service Center verification code is 551473"
+CODE_PATTERN = re.compile(r'verification code is (\d{6})', re.IGNORECASE)
+# Fallback: any 6-digit number
+ANY_SIX_DIGITS_PATTERN = re.compile(r'\b(\d{6})\b')
+
 
 def fetch_guard_verification_code(max_retries=5, retry_delay=10):
     """
@@ -150,11 +156,7 @@ def fetch_guard_verification_code(max_retries=5, retry_delay=10):
                                 body = msg.get_payload(decode=True).decode()
                             
                             # Extract verification code
-                            # Guard format: "Your Agency Service Center verification code is 551473"
-                            code_match = re.search(r'verification code is (\d{6})', body, re.IGNORECASE)
-                            if not code_match:
-                                # Fallback: any 6-digit number
-                                code_match = re.search(r'\b(\d{6})\b', body)
+                            code_match = CODE_PATTERN.search(body) or ANY_SIX_DIGITS_PATTERN.search(body)
                             
                             if code_match:
                                 verification_code = code_match.group(1)
@@ -496,6 +498,26 @@ class GuardLogin:
             logger.info("Browser closed and playwright stopped")
         except Exception as e:
             logger.error(f"Error closing browser: {e}", exc_info=True)
+        finally:
+            # Safe to call again (e.g. by a GuardQuote sharing this browser)
+            self.context = None
+            self.page = None
+            self.playwright = None
+    
+    async def start_trace_segment(self, trace_id: str):
+        """
+        Save the trace recorded so far and keep recording into a new trace file
+        Lets one browser produce separate login/account and quote traces
+        """
+        if self.enable_tracing and self.context:
+            await self.context.tracing.stop_chunk(path=str(self.trace_path))
+            logger.info(f"Trace segment saved: {self.trace_path}")
+            await self.context.tracing.start_chunk()
+        
+        self.trace_id = trace_id
+        if self.enable_tracing:
+            self.trace_path = TRACE_DIR / f"{trace_id}.zip"
+            logger.info(f"Trace will be saved to: {self.trace_path}")
 
 
     async def setup_account(self, account_data: dict):
@@ -767,10 +789,8 @@ class GuardLogin:
                 return result
             logger.info("✅ Authentication successful")
             
-            # Step 3: Close login browser and start quote automation
-            logger.info("Step 3: Closing login browser, starting quote automation...")
-            await self.close()
-            logger.info("Login browser closed")
+            # Step 3: Start quote automation in the same (already logged in) browser
+            logger.info("Step 3: Starting quote automation...")
             
             # Import here to avoid circular imports
             from guard_quote import GuardQuote
@@ -786,15 +806,16 @@ class GuardLogin:
             
             logger.info(f"Quote parameters: {quote_params}")
             
-            # Initialize quote handler with same task_id for session sharing
+            # Quote handler reuses this browser - no second Chromium launch
             quote_handler = GuardQuote(
                 policy_code=policy_code,
                 task_id=self.task_id,  # Share session
+                login_handler=self,
                 **quote_params
             )
             
             try:
-                # Initialize browser
+                # Attach to the open browser
                 await quote_handler.init_browser()
                 
                 # Login (should use existing session)
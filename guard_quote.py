@@ -22,7 +22,8 @@ class GuardQuote:
                  year_built: str = "2025",
                  square_footage: str = "2000",
                  mpds: str = "6",
-                 employees: str = "3"):
+                 employees: str = "3",
+                 login_handler: GuardLogin = None):
         """
         Initialize Guard Quote automation
         
@@ -36,12 +37,13 @@ class GuardQuote:
             square_footage: Total building square footage (used for both total and occupied)
             mpds: Number of Gas Pumps (MPDs)
             employees: Number of employees (default: 3)
+            login_handler: Already-open GuardLogin to reuse (skips launching a second browser)
         """
         self.policy_code = policy_code
         self.quotation_url = f"https://gigezrate.guard.com/dotnet/mvc/uw/EZRate/EZR_AddNewProspectShell/Home/Index?MGACODE={policy_code}"
         self.task_id = task_id
         self.trace_id = trace_id or f"quote_{policy_code}"
-        self.login_handler = GuardLogin(task_id=task_id, trace_id=self.trace_id)
+        self.login_handler = login_handler or GuardLogin(task_id=task_id, trace_id=self.trace_id)
         self.page = None
         
         # Webhook data
@@ -72,8 +74,12 @@ class GuardQuote:
         logger.info(f"MPDs: {mpds}")
     
     async def init_browser(self):
-        """Initialize browser through login handler"""
-        await self.login_handler.init_browser()
+        """Initialize browser through login handler (or attach to its open browser)"""
+        if self.login_handler.page is None:
+            await self.login_handler.init_browser()
+        else:
+            # Browser already open - record the quote steps into their own trace file
+            await self.login_handler.start_trace_segment(self.trace_id)
         self.page = self.login_handler.page
         logger.info("✅ Browser initialized")
     
@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration for the Guard webhook server (production / Railway)
+
+Usage: gunicorn -c gunicorn_conf.py webhook_server:app
+For local development `python webhook_server.py` still starts Flask's dev server.
+"""
+import os
+
+from config import WEBHOOK_HOST, WEBHOOK_PORT
+
+bind = f"{WEBHOOK_HOST}:{WEBHOOK_PORT}"
+
+# One worker process: the task queue, active_sessions and the automation
+# worker threads (started by post_worker_init below) live in its memory,
+# so a second process would have its own queue and unknown task IDs
+workers = 1
+
+# Import the app inside the worker, not the master
+preload_app = False
+
+# Threaded worker: webhook/status requests are short and I/O-bound, and each
+# open /task/<id>/events stream holds one thread. gevent is not used because
+# its monkey-patching does not mix with the Playwright worker threads.
+# Idle keep-alive connections wait in gthread's poller, not on a thread, so
+# only in-flight requests and open event streams count against `threads`;
+# raise GUNICORN_THREADS if many clients stream status at once.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 32))
+
+# Keep idle client connections open between status polls
+keepalive = 5
+
+timeout = 120
+graceful_timeout = 30
+
+# Log to stdout/stderr (collected by Railway)
+accesslog = "-"
+errorlog = "-"
+
+
+def post_worker_init(worker):
+    """Start the automation worker threads in the worker process, once the app is loaded"""
+    from webhook_server import init_workers
+    init_workers()
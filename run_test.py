@@ -1,9 +1,19 @@
 """Quick test script for Railway server"""
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 RAILWAY_URL = 'https://guardsubmissionbot-production.up.railway.app'
 
+# One session for every call - status polls reuse the same keep-alive connection
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
 print('=' * 80)
 print('GUARD AUTOMATION - RAILWAY SERVER TEST')
 print('=' * 80)
@@ -11,7 +21,7 @@ print('=' * 80)
 # Check health first
 print('\n[CHECK] Testing server health...')
 try:
-    response = requests.get(f'{RAILWAY_URL}/health', timeout=15)
+    response = session.get(f'{RAILWAY_URL}/health', timeout=15)
     if response.status_code == 200:
         data = response.json()
         print(f'\n[OK] Server is HEALTHY!')
@@ -56,7 +66,7 @@ print(f'[DATA] MPDs (Pumps): 8')
 
 try:
     print('\n[SENDING...]')
-    response = requests.post(f'{RAILWAY_URL}/webhook', json=payload, timeout=30)
+    response = session.post(f'{RAILWAY_URL}/webhook', json=payload, timeout=30)
     result = response.json()
     print(f'\n[RESULT] Status: {result.get("status", "N/A")}')
     print(f'[RESULT] Message: {result.get("message", "N/A")}')
@@ -70,7 +80,7 @@ try:
         for i in range(60):
             time.sleep(5)
             try:
-                status_resp = requests.get(f'{RAILWAY_URL}/task/{task_id}/status', timeout=10)
+                status_resp = session.get(f'{RAILWAY_URL}/task/{task_id}/status', timeout=10)
                 if status_resp.status_code == 200:
                     status = status_resp.json()
                     current = status.get('status', 'unknown')
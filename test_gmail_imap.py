@@ -5,6 +5,7 @@ This will help verify your app password works and can read Guard verification em
 import imaplib
 import email
 from email.header import decode_header
+from email.parser import BytesHeaderParser
 import re
 from datetime import datetime
 
@@ -15,6 +16,38 @@ GMAIL_APP_PASSWORD = "gqlv wrxq peqb esrg"  # Your app password (remove spaces)
 # Remove spaces from app password
 GMAIL_APP_PASSWORD = GMAIL_APP_PASSWORD.replace(" ", "")
 
+# Verification code patterns (compiled once, reused for every email)
+# Guard format: "Your Agency Service Center verification code is 551473"
+CODE_PATTERN = re.compile(r'verification code is (\d{6})', re.IGNORECASE)
+# Fallback: any 6-digit number
+ANY_SIX_DIGITS_PATTERN = re.compile(r'\b(\d{6})\b')
+
+# Partial fetches: headers first, then only the start of the body for Guard emails.
+# The MIME headers are included so the body prefix can still be decoded.
+HEADER_FETCH = "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE CONTENT-TYPE CONTENT-TRANSFER-ENCODING)])"
+BODY_PREFIX_FETCH = "(BODY.PEEK[TEXT]<0.4096>)"
+
+
+def fetch_parts(mail, email_ids, spec):
+    """Fetch one item for several messages in a single FETCH round trip.
+    Returns {email_id: bytes}; messages missing from the response are left out."""
+    if not email_ids:
+        return {}
+    status, msg_data = mail.fetch(b",".join(email_ids), spec)
+    if status != "OK":
+        return {}
+    parts = {}
+    for response_part in msg_data:
+        if isinstance(response_part, tuple):
+            parts[response_part[0].split(None, 1)[0]] = response_part[1]
+    return parts
+
+
+def decode_part(part):
+    """Decode a (possibly truncated) text part to str"""
+    payload = part.get_payload(decode=True) or b""
+    return payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+
 print("=" * 80)
 print("TESTING GMAIL IMAP CONNECTION")
 print("=" * 80)
@@ -35,9 +68,9 @@ try:
     mail.select("INBOX")
     print("✅ INBOX selected")
     
-    # Search for recent emails (all emails, then filter)
-    print("\n[4] Searching for recent emails...")
-    status, messages = mail.search(None, "ALL")
+    # Search server-side for Guard emails only, so unrelated mail is never transferred
+    print("\n[4] Searching for recent Guard emails...")
+    status, messages = mail.search(None, '(OR FROM "guard" SUBJECT "guard")')
     
     if status != "OK":
         print("❌ Failed to search emails")
@@ -46,83 +79,86 @@ try:
     # Get list of email IDs
     email_ids = messages[0].split()
     
-    # Get last 10 emails (to catch Guard verification email)
+    # Get the last 10 Guard emails (to catch the verification email)
     recent_emails = email_ids[-10:] if len(email_ids) >= 10 else email_ids
     
-    print(f"✅ Found {len(email_ids)} total emails")
-    print(f"📧 Fetching last {len(recent_emails)} emails (looking for Guard verification)...\n")
+    print(f"✅ Found {len(email_ids)} Guard emails")
+    print(f"📧 Fetching last {len(recent_emails)} Guard emails (looking for the verification code)...\n")
     
     print("=" * 80)
     
-    guard_emails_found = 0
+    # Fetch the headers of every recent email in one round trip
+    ordered_ids = list(reversed(recent_emails))
+    header_parts = fetch_parts(mail, ordered_ids, HEADER_FETCH)
     
-    for i, email_id in enumerate(reversed(recent_emails), 1):
-        # Fetch email
-        status, msg_data = mail.fetch(email_id, "(RFC822)")
+    guard_emails = []
+    for i, email_id in enumerate(ordered_ids, 1):
+        header_bytes = header_parts.get(email_id)
         
-        if status != "OK":
+        if header_bytes is None:
             print(f"❌ Failed to fetch email {email_id}")
             continue
         
-        # Parse email
-        for response_part in msg_data:
-            if isinstance(response_part, tuple):
-                msg = email.message_from_bytes(response_part[1])
-                
-                # Decode subject
-                subject = decode_header(msg["Subject"])[0][0]
-                if isinstance(subject, bytes):
-                    subject = subject.decode()
-                
-                # Get sender
-                from_email = msg.get("From")
-                
-                # Skip if not from Guard
-                if "guard" not in from_email.lower() and "guard" not in subject.lower():
-                    continue
-                
-                guard_emails_found += 1
-                
-                # Get date
-                date = msg.get("Date")
-                
-                # Get email body
-                body = ""
-                if msg.is_multipart():
-                    for part in msg.walk():
-                        if part.get_content_type() == "text/plain":
-                            body = part.get_payload(decode=True).decode()
-                            break
-                        elif part.get_content_type() == "text/html":
-                            body = part.get_payload(decode=True).decode()
-                else:
-                    body = msg.get_payload(decode=True).decode()
-                
-                # Try to extract 6-digit verification code
-                # Guard format: "Your Agency Service Center verification code is 551473"
-                code_match = re.search(r'verification code is (\d{6})', body, re.IGNORECASE)
-                if not code_match:
-                    # Fallback: any 6-digit number
-                    code_match = re.search(r'\b(\d{6})\b', body)
-                verification_code = code_match.group(1) if code_match else None
-                
-                print(f"\n📧 EMAIL #{i}")
-                print("-" * 80)
-                print(f"From:    {from_email}")
-                print(f"Subject: {subject}")
-                print(f"Date:    {date}")
-                print(f"\nBody Preview (first 200 chars):")
-                print(body[:200].replace("\n", " ").replace("\r", ""))
-                
-                if verification_code:
-                    print(f"\n🔑 VERIFICATION CODE FOUND: {verification_code}")
-                else:
-                    print("\n⚠️  No 6-digit code found in email")
-                
-                print("-" * 80)
+        headers = BytesHeaderParser().parsebytes(header_bytes)
+        
+        # Decode subject
+        subject = decode_header(headers.get("Subject", ""))[0][0]
+        if isinstance(subject, bytes):
+            subject = subject.decode()
+        
+        # Get sender
+        from_email = headers.get("From", "")
+        
+        # Skip if not from Guard
+        from_lower = from_email.lower()
+        subject_lower = subject.lower()
+        if "guard" not in from_lower and "guard" not in subject_lower:
+            continue
+        
+        guard_emails.append((i, email_id, header_bytes, from_email, subject, headers.get("Date")))
+    
+    guard_emails_found = len(guard_emails)
+    
+    # Fetch the first 4 KB of every Guard email body in one more round trip
+    body_parts = fetch_parts(mail, [email_id for _, email_id, *_ in guard_emails], BODY_PREFIX_FETCH)
+    
+    for i, email_id, header_bytes, from_email, subject, date in guard_emails:
+        # Parse the body prefix together with its MIME headers
+        msg = email.message_from_bytes(header_bytes + body_parts.get(email_id, b""))
+        
+        # Get email body
+        body = ""
+        if msg.is_multipart():
+            for part in msg.walk():
+                if part.get_content_type() == "text/plain":
+                    body = decode_part(part)
+                    break
+                elif part.get_content_type() == "text/html":
+                    body = decode_part(part)
+        else:
+            body = decode_part(msg)
+        
+        # Try to extract 6-digit verification code
+        code_match = CODE_PATTERN.search(body) or ANY_SIX_DIGITS_PATTERN.search(body)
+        verification_code = code_match.group(1) if code_match else None
+        
+        print(f"\n📧 EMAIL #{i}")
+        print("-" * 80)
+        print(f"From:    {from_email}")
+        print(f"Subject: {subject}")
+        print(f"Date:    {date}")
+        print(f"\nBody Preview (first 200 chars):")
+        print(body[:200].replace("\n", " ").replace("\r", ""))
+        
+        if verification_code:
+            print(f"\n🔑 VERIFICATION CODE FOUND: {verification_code}")
+        else:
+            print("\n⚠️  No 6-digit code found in email")
+        
+        print("-" * 80)
     
     if guard_emails_found == 0:
-        print("\n⚠️  No Guard verification emails found in last 10 emails")
+        print("\n⚠️  No Guard verification emails found in the last 10 Guard emails")
         print("Tip: Try logging into Guard portal to trigger a new verification email")
     else:
         print(f"\n✅ Found {guard_emails_found} Guard email(s)!")
@@ -2,10 +2,15 @@
 Test local webhook server - sends data to localhost:5001
 Run webhook_server.py first, then run this test
 """
+import argparse
 import requests
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+from guard_cli import GuardClient
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -14,11 +19,53 @@ if sys.platform == 'win32':
     except:
         pass
 
-WEBHOOK_URL = "http://localhost:5001/webhook"
-STATUS_URL_BASE = "http://localhost:5001/task"
-TRACE_URL_BASE = "http://localhost:5001/trace"
+SERVER_URL = "http://localhost:5001"
+WEBHOOK_URL = f"{SERVER_URL}/webhook"
+STATUS_URL_BASE = f"{SERVER_URL}/task"
+TRACE_URL_BASE = f"{SERVER_URL}/trace"
 TRACES_DIR = Path(__file__).parent / "traces"
 
+# One keep-alive session for the health check, the webhook POST, the status
+# stream/polls and the trace download - a single localhost socket per run
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+SESSION.headers['Connection'] = 'keep-alive'
+
+
+def ask_test_mode() -> str:
+    """Ask user which flow to test"""
+    print("\nSelect test mode:")
+    print("1. Use existing policy code (TEBP602893)")
+    print("2. Create new account (get new policy code)")
+    return input("\nEnter choice (1 or 2): ").strip()
+
+
+def build_payload(choice: str, task_id: str) -> dict:
+    """Webhook payload for the chosen test mode"""
+    quote_data = {
+        "combined_sales": "800000",
+        "gas_gallons": "500000",
+        "year_built": "2000",
+        "square_footage": "4200",
+        "mpds": "6"
+    }
+    if choice == "2":
+        # Create new account flow
+        return {
+            "action": "start_automation",
+            "task_id": task_id,
+            "create_account": True,
+            "quote_data": quote_data
+        }
+    # Use existing policy code
+    return {
+        "action": "start_automation",
+        "task_id": task_id,
+        "policy_code": "BIBP608141",
+        "create_account": False,
+        "quote_data": quote_data
+    }
+
 
 def test_local_webhook():
     """Send a test request to local webhook server"""
@@ -29,57 +76,23 @@ def test_local_webhook():
     print("Run: python webhook_server.py")
     print("=" * 80)
     
-    # Ask user which flow to test
-    print("\nSelect test mode:")
-    print("1. Use existing policy code (TEBP602893)")
-    print("2. Create new account (get new policy code)")
-    choice = input("\nEnter choice (1 or 2): ").strip()
+    choice = ask_test_mode()
     
     # Test data - Guard automation format
     task_id = f"local_test_{int(time.time())}"
+    payload = build_payload(choice, task_id)
     
+    print(f"\n[REQUEST] Sending to: {WEBHOOK_URL}")
+    print(f"[TASK ID] {task_id}")
     if choice == "2":
-        # Create new account flow
-        payload = {
-            "action": "start_automation",
-            "task_id": task_id,
-            "create_account": True,
-            "quote_data": {
-                "combined_sales": "800000",
-                "gas_gallons": "500000",
-                "year_built": "2000",
-                "square_footage": "4200",
-                "mpds": "6"
-            }
-        }
-        print(f"\n[REQUEST] Sending to: {WEBHOOK_URL}")
-        print(f"[TASK ID] {task_id}")
         print(f"[MODE] CREATE NEW ACCOUNT")
-        print(f"[DATA] Combined Sales: $800,000 | Gas Gallons: 500,000")
-        print(f"[DATA] Year Built: 2000 | Square Footage: 4,200 | Pumps: 6")
     else:
-        # Use existing policy code
-        payload = {
-            "action": "start_automation",
-            "task_id": task_id,
-            "policy_code": "BIBP608141",
-            "create_account": False,
-            "quote_data": {
-                "combined_sales": "800000",
-                "gas_gallons": "500000",
-                "year_built": "2000",
-                "square_footage": "4200",
-                "mpds": "6"
-            }
-        }
-        print(f"\n[REQUEST] Sending to: {WEBHOOK_URL}")
-        print(f"[TASK ID] {task_id}")
         print(f"[POLICY] TEBP602893 - BISMILLAH LLC")
-        print(f"[DATA] Combined Sales: $800,000 | Gas Gallons: 500,000")
-        print(f"[DATA] Year Built: 2000 | Square Footage: 4,200 | Pumps: 6")
+    print(f"[DATA] Combined Sales: $800,000 | Gas Gallons: 500,000")
+    print(f"[DATA] Year Built: 2000 | Square Footage: 4,200 | Pumps: 6")
     
     try:
-        response = requests.post(WEBHOOK_URL, json=payload, timeout=30)
+        response = SESSION.post(WEBHOOK_URL, json=payload, timeout=30)
         response.raise_for_status()
         result = response.json()
         print(f"\n[OK] Request accepted: {result.get('message', 'OK')}")
@@ -94,76 +107,102 @@ def test_local_webhook():
         print(f"\n[ERROR] Failed to send request: {e}")
         return
     
-    # Monitor task status
+    # Monitor task status - pushed over the server's event stream,
+    # falling back to polling the status URL if the stream is unavailable
+    client = GuardClient(SERVER_URL, SESSION)
     status_url = f"{STATUS_URL_BASE}/{task_id}/status"
     print(f"\n[MONITOR] Checking task status...")
     print(f"[URL] {status_url}")
     
     max_wait = 300
     start_time = time.time()
-    last_status = None
     
-    while time.time() - start_time < max_wait:
-        try:
-            response = requests.get(status_url, timeout=10)
-            if response.status_code == 200:
-                status = response.json()
-                current_status = status.get('status', 'unknown')
-                
-                if current_status != last_status:
-                    print(f"\n[STATUS] {current_status.upper()}")
-                    if status.get('queue_position'):
-                        print(f"[QUEUE] Position: {status['queue_position']}")
-                    if status.get('policy_code'):
-                        print(f"[POLICY CODE] {status.get('policy_code')}")
-                    if status.get('quotation_url'):
-                        print(f"[QUOTE URL] {status.get('quotation_url')}")
-                    last_status = current_status
-                
-                if current_status in ['completed', 'success']:
-                    print(f"\n{'=' * 80}")
-                    print(f"[SUCCESS] Task completed!")
-                    print(f"{'=' * 80}")
-                    
-                    if status.get('message'):
-                        print(f"\n[RESULT] {status.get('message')}")
-                    
-                    # Try to download trace
-                    trace_url = f"{TRACE_URL_BASE}/{task_id}"
-                    try:
-                        print(f"\n[DOWNLOAD] Fetching trace from: {trace_url}")
-                        trace_response = requests.get(trace_url, timeout=10)
-                        if trace_response.status_code == 200:
-                            trace_path = TRACES_DIR / f"{task_id}.zip"
-                            trace_path.parent.mkdir(exist_ok=True)
-                            trace_path.write_bytes(trace_response.content)
-                            print(f"[OK] Trace saved: {trace_path}")
-                            print(f"[VIEW] Run: playwright show-trace {trace_path}")
-                        else:
-                            print(f"[INFO] Trace not available")
-                    except Exception as e:
-                        print(f"[INFO] Could not download trace: {e}")
-                    
-                    break
-                    
-                elif current_status in ['failed', 'error']:
-                    print(f"\n{'=' * 80}")
-                    print(f"[FAILED] Task failed!")
-                    print(f"{'=' * 80}")
-                    if status.get('error'):
-                        print(f"[ERROR] {status['error']}")
-                    break
-                    
-            elif response.status_code == 404:
-                print(f"[INFO] Task not found yet")
+    # Every status yielded is a new version - the server only sends changes
+    for status in client.stream_status(task_id, start_time, max_wait):
+        current_status = status.get('status', 'unknown')
+        
+        print(f"\n[STATUS] {current_status.upper()}")
+        if status.get('queue_position'):
+            print(f"[QUEUE] Position: {status['queue_position']}")
+        if status.get('policy_code'):
+            print(f"[POLICY CODE] {status['policy_code']}")
+        if status.get('quotation_url'):
+            print(f"[QUOTE URL] {status['quotation_url']}")
+        
+        if current_status in ['completed', 'success']:
+            print(f"\n{'=' * 80}")
+            print(f"[SUCCESS] Task completed!")
+            print(f"{'=' * 80}")
+            
+            if status.get('message'):
+                print(f"\n[RESULT] {status.get('message')}")
+            
+            # Try to download trace
+            trace_url = f"{TRACE_URL_BASE}/{task_id}"
+            try:
+                print(f"\n[DOWNLOAD] Fetching trace from: {trace_url}")
+                trace_path = client.download_trace(task_id, TRACES_DIR)
+                if trace_path:
+                    print(f"[OK] Trace saved: {trace_path}")
+                    print(f"[VIEW] Run: playwright show-trace {trace_path}")
+                else:
+                    print(f"[INFO] Trace not available")
+            except Exception as e:
+                print(f"[INFO] Could not download trace: {e}")
             
+            break
+            
+        elif current_status in ['failed', 'error']:
+            print(f"\n{'=' * 80}")
+            print(f"[FAILED] Task failed!")
+            print(f"{'=' * 80}")
+            if status.get('error'):
+                print(f"[ERROR] {status['error']}")
+            break
+    else:
+        print(f"\n[TIMEOUT] Task did not complete within {max_wait} seconds")
+    
+    print(f"\n{'=' * 80}")
+    print("[DONE]")
+    print("=" * 80)
+
+
+def test_concurrent_webhooks(concurrency: int):
+    """Submit several tasks at once, then follow all of them concurrently"""
+    print("=" * 80)
+    print(f"TEST GUARD WEBHOOK SERVER (LOCAL) - {concurrency} CONCURRENT TASKS")
+    print("=" * 80)
+    
+    choice = ask_test_mode()
+    
+    # Room for one status stream per task plus the submissions
+    SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=concurrency + 4, max_retries=0))
+    
+    batch_id = int(time.time())
+    payloads = [build_payload(choice, f"local_test_{batch_id}_{n}") for n in range(1, concurrency + 1)]
+    
+    def submit(payload):
+        try:
+            response = SESSION.post(WEBHOOK_URL, json=payload, timeout=30)
+            response.raise_for_status()
+            return payload["task_id"]
         except Exception as e:
-            print(f"[WARNING] Error checking status: {e}")
-        
-        time.sleep(3)
+            print(f"[ERROR] {payload['task_id']}: failed to send request: {e}")
+            return None
     
-    if time.time() - start_time >= max_wait:
-        print(f"\n[TIMEOUT] Task did not complete within {max_wait} seconds")
+    print(f"\n[REQUEST] Sending {concurrency} requests to: {WEBHOOK_URL}")
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        task_ids = [task_id for task_id in executor.map(submit, payloads) if task_id]
+    print(f"[OK] {len(task_ids)}/{concurrency} requests accepted")
+    
+    if task_ids:
+        # Tasks share one browser and run one after another, so allow for all of them
+        results = GuardClient(SERVER_URL, SESSION).monitor_many(task_ids, max_wait=300 * len(task_ids))
+        
+        print(f"\n{'=' * 80}")
+        print("[RESULTS]")
+        for task_id, success in results.items():
+            print(f"  {'[SUCCESS]' if success else '[FAILED] '} {task_id}")
     
     print(f"\n{'=' * 80}")
     print("[DONE]")
@@ -173,7 +212,7 @@ def test_local_webhook():
 def check_server_health():
     """Check if webhook server is running"""
     try:
-        response = requests.get("http://localhost:5001/health", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/health", timeout=5)
         if response.status_code == 200:
             print("[OK] Webhook server is running!")
             return True
@@ -190,10 +229,18 @@ def check_server_health():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test the local Guard webhook server")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of tasks to submit at once (default: 1)")
+    args = parser.parse_args()
+    
     print("\n[CHECK] Testing server health...")
     if check_server_health():
         print("\n" + "=" * 80)
-        test_local_webhook()
+        if args.concurrency > 1:
+            test_concurrent_webhooks(args.concurrency)
+        else:
+            test_local_webhook()
     else:
         print("\n[ABORT] Server not running")
         print("[INFO] Start the server:")
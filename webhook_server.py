@@ -4,35 +4,65 @@ Receives data from Next.js app and triggers Guard automation
 Version: 2.0.0 - Added trace system, cleanup scheduler
 """
 import asyncio
+import atexit
+import gzip
 import json
 import logging
+import os
 import threading
 import queue
+import re
 import time
+import traceback
 import shutil
-from datetime import datetime
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from flask import Flask, request, jsonify, send_file
+from types import MappingProxyType
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import BadRequest
+import msgpack
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from guard_login import GuardLogin
 from config import (
     WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH, LOG_DIR, TRACE_DIR, SESSION_DIR,
-    MAX_WORKERS, COVERSHEET_WEBHOOK_URL
+    MAX_WORKERS, COVERSHEET_WEBHOOK_URL, COVERSHEET_WEBHOOK_BATCH
 )
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_DIR / 'webhook_server.log'),
-        logging.StreamHandler()
-    ]
+# Setup logging - records are queued and written by a background listener thread,
+# so request and worker threads never wait on the log file or console
+log_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
 )
+log_handlers = [logging.FileHandler(LOG_DIR / 'webhook_server.log'), logging.StreamHandler()]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+log_queue = queue.Queue()
+log_listener = QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# force: guard_login's basicConfig has already configured the root logger on import
+# (the queue handler passes the bare message on; the listener's handlers add the prefix)
+logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(log_queue)], force=True)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# Serialize responses in insertion order - skips sorting every status dict's keys
+app.json.sort_keys = False
+# Always compact (Flask pretty-prints in debug mode) and write non-ASCII text
+# as UTF-8 instead of \uXXXX escapes - less work per response and smaller bodies
+app.json.compact = True
+app.json.ensure_ascii = False
 # Enable CORS for Next.js
 CORS(app, resources={
     r"/*": {
@@ -45,31 +75,155 @@ CORS(app, resources={
 # Store active sessions
 active_sessions = {}
 
+# Notified on every status change (see set_task_status), so /events streams
+# wake up immediately instead of re-checking on a timer
+status_changed = threading.Condition()
+status_version = 0  # Bumped on every status change
+
+# When each finished task reached its terminal status (time.monotonic()),
+# oldest first - used to evict finished tasks from active_sessions
+finished_at = {}
+
+# status_version at each task's last change - a cheap ETag for /task/<id>/status
+task_versions = {}
+
 # Queue system
 task_queue = queue.Queue()
-active_workers = 0
-worker_lock = threading.Lock()
-queue_position = {}
+active_workers = 0  # Only changed while holding browser_lock, which serializes the updates
 
-# Browser lock - only ONE browser at a time
+# Browser lock - only ONE browser at a time (every task uses the same persistent
+# "default" profile, which a single Chromium instance can have open)
 browser_lock = threading.Lock()
-browser_in_use = False
+
+# Largest request body accepted after gzip decompression
+MAX_WEBHOOK_BODY_BYTES = 1024 * 1024
+
+# Responses at least this large are gzip-compressed for clients that accept it
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_MIMETYPES = ('application/json', 'text/html')
+
+# Account used when a create_account request carries no account_data
+# (read-only - tasks build their own merged dict from it)
+DEFAULT_ACCOUNT_DATA = MappingProxyType({
+    "legal_entity": "L",
+    "applicant_name": "TEST COMPANY LLC",
+    "dba": "",
+    "address1": "280 Griffin St",
+    "address2": "",
+    "zipcode": "30253-3100",
+    "city": "McDonough",
+    "state": "GA",
+    "contact_name": "John Doe",
+    "contact_phone": {"area": "404", "prefix": "555", "suffix": "9999"},
+    "email": "test@example.com",
+    "years_in_business": "5",
+    "ownership_type": "tenant"
+})
+
+# Quote fields used when the request's quote_data leaves them out
+DEFAULT_QUOTE_PARAMS = {
+    "combined_sales": "1000000",
+    "gas_gallons": "100000",
+    "year_built": "2025",
+    "square_footage": "2000",
+    "mpds": "6",
+    "employees": "3",
+}
+
+# Account fields that are the same for every submission (not sent by the user)
+HARDCODED_ACCOUNT_FIELDS = MappingProxyType({
+    "website": "",
+    "producer_id": "2774846",
+    "csr_id": "16977940",
+    "industry_id": "11",  # Gas Station
+    "sub_industry_id": "45",
+    "business_type_id": "127",
+    "lines_of_business": ("CB",),  # Commercial Business
+})
+
+# Webhook payload fields and their accepted JSON types (see WebhookPayload)
+WEBHOOK_FIELD_TYPES = {
+    "action": str,
+    "task_id": str,
+    "submission_id": (str, int),
+    "policy_code": str,
+    "create_account": bool,
+    "quote_data": dict,
+    "account_data": dict,
+}
+
+# Characters replaced in trace file names - anything str.isalnum() rejects
+# (\w is alphanumerics plus "_")
+NON_ALNUM_PATTERN = re.compile(r"[\W_]")
+
+# Longest traceback kept in a task's status or sent to Coversheet (the end of
+# the traceback is kept)
+MAX_TRACEBACK_CHARS = 4096
+
+# Task status event stream (/task/<id>/events)
+TERMINAL_STATUSES = ("completed", "failed", "error")
+EVENTS_HEARTBEAT_SECONDS = 15  # Comment line sent on a quiet stream to keep proxies from closing it
+
+# Finished tasks are dropped from active_sessions after this long, so a
+# long-running server doesn't keep every task it has ever seen in memory
+SESSION_TTL_HOURS = 24
+# Hard cap on tracked tasks - past it the oldest finished tasks are dropped
+# early (queued and running tasks are never dropped)
+MAX_TRACKED_TASKS = 10_000
+MAX_LISTED_TASKS = 200  # /tasks returns only the most recent tasks
+
+# /traces and /bundle reuse the trace directory listing instead of listing and
+# stat()-ing every trace file on each request. Traces are only written by
+# tasks and deleted by cleanup, and both invalidate the listing
+# (invalidate_trace_infos), so the TTL is only a backstop for files changed
+# outside this process.
+TRACE_LIST_TTL_SECONDS = 300
+trace_infos_cache = {"at": 0.0, "traces": [], "generation": 0}
 
 # Cleanup scheduler configuration
 CLEANUP_INTERVAL_HOURS = 6  # Run cleanup every 6 hours
 CLEANUP_MAX_AGE_DAYS = 2  # Delete files older than 2 days
 MAX_TRACE_FILES = 5  # Keep only last 5 trace files
+CLEANUP_THREADS = 4  # Files/folders deleted in parallel
+
+# Set by init_workers - importing this module starts no threads by itself
+workers_started = False
+workers_started_lock = threading.Lock()
 
 # Cleanup scheduler thread
 cleanup_thread = None
 cleanup_stop_event = threading.Event()
 
+# Coversheet callbacks are sent by one background thread over a keep-alive
+# session, so a finished task doesn't wait on the Coversheet server
+notify_queue = queue.Queue()
+notifier_thread = None
+# One pooled connection is enough for one sender thread. Connection failures
+# are retried (the callback never reached Coversheet); read errors and error
+# statuses are not, so a callback is never delivered twice.
+COVERSHEET_RETRY = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+coversheet_session = requests.Session()
+coversheet_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=COVERSHEET_RETRY))
+coversheet_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=COVERSHEET_RETRY))
+NOTIFY_FLUSH_TIMEOUT_SECONDS = 15  # How long shutdown waits for queued callbacks
+# Callbacks queued within this window of each other are sent together
+# (back-to-back on one connection, or as one POST with COVERSHEET_WEBHOOK_BATCH)
+NOTIFY_BATCH_WINDOW_SECONDS = 0.05
+NOTIFY_BATCH_MAX = 32
+
+
+def safe_trace_name(name: str) -> str:
+    """Company name as a trace file name: non-alphanumerics become "_", at most 30 chars, lowercase"""
+    return NON_ALNUM_PATTERN.sub("_", name[:30]).lower()
+
 
+@lru_cache(maxsize=4096)
 def extract_submission_id(task_id: str) -> str:
     """
     Extract submission_id from task_id
     Format: guard_{submission_id}_{timestamp} or guard_{timestamp}
     Returns submission_id if found, otherwise returns task_id
+    Pure function of task_id, so results are cached
     """
     if not task_id:
         return None
@@ -91,6 +245,84 @@ def extract_submission_id(task_id: str) -> str:
     return task_id
 
 
+def set_task_status(task_id: str, status: dict):
+    """
+    Store a new task's status and wake any /task/<id>/events streams
+    Later transitions use update_task_status, which keeps the fields set here
+    """
+    global status_version
+    with status_changed:
+        # A reused task_id starts over - its old finish time must not get the
+        # new (unfinished) task evicted
+        finished_at.pop(task_id, None)
+        evict_finished_tasks()
+        active_sessions[task_id] = status
+        status_version += 1
+        task_versions[task_id] = status_version
+        status_changed.notify_all()
+
+
+def update_task_status(task_id: str, **fields):
+    """Update fields of a known task's status (unknown tasks are ignored) and wake any streams"""
+    global status_version
+    with status_changed:
+        if task_id not in active_sessions:
+            return
+        active_sessions[task_id].update(fields)
+        if fields.get("status") in TERMINAL_STATUSES:
+            # Re-insert so finished_at stays ordered by finish time
+            finished_at.pop(task_id, None)
+            finished_at[task_id] = time.monotonic()
+        status_version += 1
+        task_versions[task_id] = status_version
+        status_changed.notify_all()
+
+
+def evict_finished_tasks():
+    """
+    Drop tasks that finished more than SESSION_TTL_HOURS ago, and more of the
+    oldest finished tasks while active_sessions is at MAX_TRACKED_TASKS
+    Caller must hold status_changed. finished_at is ordered by finish time,
+    so this stops at the first task that is still fresh.
+    """
+    cutoff = time.monotonic() - SESSION_TTL_HOURS * 3600
+    while finished_at:
+        task_id, finished = next(iter(finished_at.items()))
+        if finished > cutoff and len(active_sessions) < MAX_TRACKED_TASKS:
+            break
+        del finished_at[task_id]
+        active_sessions.pop(task_id, None)
+        task_versions.pop(task_id, None)
+
+
+def get_task_snapshot(task_id: str):
+    """Copy of a task's status taken under the status lock (None if unknown) - safe to serialize"""
+    with status_changed:
+        status = active_sessions.get(task_id)
+        return dict(status) if status is not None else None
+
+
+def get_all_task_snapshots(limit: int = None) -> tuple:
+    """
+    Copies of the most recent tasks' statuses (all if limit is None), oldest
+    first, taken together under the status lock; also returns the total count
+    """
+    with status_changed:
+        statuses = active_sessions.values()
+        if limit is not None:
+            # active_sessions is in creation order - the newest are at the end
+            statuses = list(islice(reversed(statuses), limit))[::-1]
+        return [dict(status) for status in statuses], len(active_sessions)
+
+
+@lru_cache(maxsize=1)
+def _policy_inception(today_ord: int, offset_days: int = 2) -> str:
+    """Policy inception date (MM/DD/YYYY) offset from the given day - formatted once per day"""
+    inception = date.fromordinal(today_ord) + timedelta(days=offset_days)
+    # Format from the date fields directly (no locale-aware strftime)
+    return f"{inception.month:02d}/{inception.day:02d}/{inception.year}"
+
+
 def notify_coversheet_completion(task_id: str, submission_id: str = None, success: bool = True, 
                                  result_data: dict = None, error: str = None, error_details: str = None):
     """
@@ -134,19 +366,37 @@ def notify_coversheet_completion(task_id: str, submission_id: str = None, succes
             logger.info(f"[WEBHOOK] Skipping Coversheet notification - URL not configured")
             return
         
-        # Send webhook callback
-        logger.info(f"[WEBHOOK] Notifying Coversheet: {payload['status']} for task {task_id}")
+        # Sent by notifier_loop - the calling worker moves on immediately
+        logger.info(f"[WEBHOOK] Queueing Coversheet notification: {payload['status']} for task {task_id}")
+        notify_queue.put(payload)
+        
+    except Exception as e:
+        logger.warning(f"[WEBHOOK] ⚠️ Error notifying Coversheet: {e}", exc_info=True)
+        # Don't fail the automation if webhook fails - just log it
+
+
+def send_coversheet_notification(payload: dict):
+    """
+    POST a completion payload to Coversheet (failures are logged, never raised)
+    payload is one task's result, or {"events": [...]} for a batch
+    """
+    try:
+        if "events" in payload:
+            logger.info(f"[WEBHOOK] Notifying Coversheet: batch of {len(payload['events'])} tasks")
+        else:
+            logger.info(f"[WEBHOOK] Notifying Coversheet: {payload['status']} for task {payload['task_id']}")
         logger.info(f"[WEBHOOK] URL: {COVERSHEET_WEBHOOK_URL}")
-        logger.info(f"[WEBHOOK] Payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[WEBHOOK] Payload: %s", json.dumps(payload, indent=2))
         
-        response = requests.post(
+        response = coversheet_session.post(
             COVERSHEET_WEBHOOK_URL,
             json=payload,
             headers={"Content-Type": "application/json"},
             timeout=10
         )
         response.raise_for_status()
-        logger.info(f"[WEBHOOK] ✅ Successfully notified Coversheet: {payload['status']}")
+        logger.info(f"[WEBHOOK] ✅ Successfully notified Coversheet: {payload.get('status', 'batch')}")
         logger.info(f"[WEBHOOK] Response: {response.status_code} - {response.text[:200]}")
         
     except requests.exceptions.HTTPError as e:
@@ -165,74 +415,142 @@ def notify_coversheet_completion(task_id: str, submission_id: str = None, succes
         # Don't fail the automation if webhook fails - just log it
 
 
+def drain_notify_batch(first: dict) -> tuple:
+    """
+    Collect notifications queued right after `first` (up to NOTIFY_BATCH_MAX)
+    Returns (batch, stop) - stop is True if the shutdown sentinel was taken
+    """
+    batch = [first]
+    deadline = time.monotonic() + NOTIFY_BATCH_WINDOW_SECONDS
+    while len(batch) < NOTIFY_BATCH_MAX:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            payload = notify_queue.get(timeout=remaining)
+        except queue.Empty:
+            break
+        notify_queue.task_done()
+        if payload is None:
+            return batch, True
+        batch.append(payload)
+    return batch, False
+
+
+def notifier_loop():
+    """Background thread that sends queued Coversheet notifications in order"""
+    while True:
+        payload = notify_queue.get()
+        notify_queue.task_done()
+        if payload is None:
+            return
+        
+        batch, stop = drain_notify_batch(payload)
+        if COVERSHEET_WEBHOOK_BATCH and len(batch) > 1:
+            send_coversheet_notification({"carrier": "guard", "events": batch})
+        else:
+            for payload in batch:
+                send_coversheet_notification(payload)
+        if stop:
+            return
+
+
+def scan_trace_files() -> list:
+    """
+    (path, stat) for every trace zip in TRACE_DIR, newest first
+    One scandir pass and one stat() per file, shared by the listing and cleanup
+    """
+    traces = []
+    try:
+        with os.scandir(TRACE_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".zip"):
+                    continue
+                try:
+                    if entry.is_file():  # Answered from the directory read where the filesystem supports it
+                        traces.append((Path(entry.path), entry.stat()))
+                except OSError as e:
+                    logger.debug(f"Error getting info for {entry.path}: {e}")
+    except FileNotFoundError:
+        return []
+    traces.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    return traces
+
+
+def find_cleanup_candidates(now: float) -> list:
+    """
+    (path, label) pairs for cleanup_old_files to delete:
+    - browser_data folders older than CLEANUP_MAX_AGE_DAYS (except browser_data_default)
+    - trace files beyond the MAX_TRACE_FILES most recent
+    - log files older than CLEANUP_MAX_AGE_DAYS (except the current log)
+    - screenshot folders older than CLEANUP_MAX_AGE_DAYS
+    """
+    cutoff = now - CLEANUP_MAX_AGE_DAYS * 24 * 60 * 60
+    
+    def mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError as e:
+            logger.debug(f"[CLEANUP] Could not stat {path}: {e}")
+            return now  # Treat as fresh - never delete what we can't inspect
+    
+    candidates = []
+    
+    # 1. Old browser_data folders
+    for folder in SESSION_DIR.glob("browser_data_*"):
+        if folder.name != "browser_data_default" and mtime(folder) < cutoff:
+            candidates.append((folder, "browser_data"))
+    
+    # 2. Trace files beyond the most recent MAX_TRACE_FILES
+    candidates.extend((trace_file, "trace") for trace_file, _ in scan_trace_files()[MAX_TRACE_FILES:])
+    
+    # 3. Old log files
+    for log_file in LOG_DIR.glob("*.log"):
+        if log_file.name != "webhook_server.log" and mtime(log_file) < cutoff:
+            candidates.append((log_file, "log"))
+    
+    # 4. Old screenshot folders
+    screenshots_dir = LOG_DIR / "screenshots"
+    if screenshots_dir.exists():
+        for folder in screenshots_dir.iterdir():
+            if folder.is_dir() and mtime(folder) < cutoff:
+                candidates.append((folder, "screenshot folder"))
+    
+    return candidates
+
+
+def delete_cleanup_candidate(candidate: tuple) -> bool:
+    """Delete one (path, label) from find_cleanup_candidates; False if it could not be deleted"""
+    path, label = candidate
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        logger.info(f"[CLEANUP] Deleted old {label}: {path.name}")
+        return True
+    except Exception as e:
+        logger.debug(f"[CLEANUP] Could not delete {label} {path}: {e}")
+        return False
+
+
 def cleanup_old_files():
     """
-    Cleanup old files to prevent disk space issues:
-    - Delete browser_data folders older than CLEANUP_MAX_AGE_DAYS
-    - Keep only MAX_TRACE_FILES most recent trace files
-    - Delete old log files older than CLEANUP_MAX_AGE_DAYS
-    - Delete all screenshot folders
+    Cleanup old files to prevent disk space issues (see find_cleanup_candidates)
+    Folder trees and files are deleted in parallel - the work is mostly
+    waiting on unlink/rmdir syscalls
     """
     logger.info("[CLEANUP] Starting scheduled cleanup...")
-    now = time.time()
-    max_age_seconds = CLEANUP_MAX_AGE_DAYS * 24 * 60 * 60
-    deleted_count = 0
     
     try:
-        # 1. Cleanup old browser_data folders (except browser_data_default)
-        logger.info("[CLEANUP] Cleaning up old browser_data folders...")
-        for folder in SESSION_DIR.glob("browser_data_*"):
-            if folder.name == "browser_data_default":
-                continue  # Keep the default browser data folder
-            try:
-                folder_age = now - folder.stat().st_mtime
-                if folder_age > max_age_seconds:
-                    shutil.rmtree(folder)
-                    deleted_count += 1
-                    logger.info(f"[CLEANUP] Deleted old browser_data: {folder.name}")
-            except Exception as e:
-                logger.debug(f"[CLEANUP] Could not delete {folder}: {e}")
-        
-        # 2. Keep only last MAX_TRACE_FILES trace files
-        logger.info("[CLEANUP] Cleaning up old trace files...")
-        trace_files = sorted(TRACE_DIR.glob("*.zip"), key=lambda f: f.stat().st_mtime, reverse=True)
-        if len(trace_files) > MAX_TRACE_FILES:
-            for trace_file in trace_files[MAX_TRACE_FILES:]:
-                try:
-                    trace_file.unlink()
-                    deleted_count += 1
-                    logger.info(f"[CLEANUP] Deleted old trace: {trace_file.name}")
-                except Exception as e:
-                    logger.debug(f"[CLEANUP] Could not delete trace {trace_file}: {e}")
-        
-        # 3. Cleanup old log files
-        logger.info("[CLEANUP] Cleaning up old log files...")
-        for log_file in LOG_DIR.glob("*.log"):
-            if log_file.name == "webhook_server.log":
-                continue  # Don't delete current log
-            try:
-                file_age = now - log_file.stat().st_mtime
-                if file_age > max_age_seconds:
-                    log_file.unlink()
-                    deleted_count += 1
-                    logger.info(f"[CLEANUP] Deleted old log: {log_file.name}")
-            except Exception as e:
-                logger.debug(f"[CLEANUP] Could not delete log {log_file}: {e}")
+        candidates = find_cleanup_candidates(time.time())
+        deleted_count = 0
+        if candidates:
+            with ThreadPoolExecutor(max_workers=CLEANUP_THREADS, thread_name_prefix="Cleanup") as pool:
+                deleted_count = sum(pool.map(delete_cleanup_candidate, candidates))
         
-        # 4. Delete old screenshot folders
-        logger.info("[CLEANUP] Cleaning up screenshot folders...")
-        screenshots_dir = LOG_DIR / "screenshots"
-        if screenshots_dir.exists():
-            for folder in screenshots_dir.iterdir():
-                if folder.is_dir():
-                    try:
-                        folder_age = now - folder.stat().st_mtime
-                        if folder_age > max_age_seconds:
-                            shutil.rmtree(folder)
-                            deleted_count += 1
-                            logger.info(f"[CLEANUP] Deleted screenshot folder: {folder.name}")
-                    except Exception as e:
-                        logger.debug(f"[CLEANUP] Could not delete screenshot folder {folder}: {e}")
+        if any(label == "trace" for _, label in candidates):
+            invalidate_trace_infos()
         
         logger.info(f"[CLEANUP] Cleanup completed. Deleted {deleted_count} items.")
         
@@ -244,36 +562,149 @@ def cleanup_scheduler():
     """Background thread that runs cleanup periodically"""
     logger.info(f"[CLEANUP] Scheduler started - will run every {CLEANUP_INTERVAL_HOURS} hours")
     
-    while not cleanup_stop_event.is_set():
-        # Wait for interval (check stop event every minute)
-        for _ in range(CLEANUP_INTERVAL_HOURS * 60):
-            if cleanup_stop_event.is_set():
-                break
-            time.sleep(60)  # Sleep 1 minute at a time
-        
-        if not cleanup_stop_event.is_set():
-            cleanup_old_files()
+    # Sleep for the whole interval - wait() returns early (True) once stop is requested
+    while not cleanup_stop_event.wait(CLEANUP_INTERVAL_HOURS * 3600):
+        cleanup_old_files()
+        # New tasks evict expired ones as they arrive; this covers quiet periods
+        with status_changed:
+            evict_finished_tasks()
     
     logger.info("[CLEANUP] Scheduler stopped")
 
 
+def unpack_msgpack_body(body: bytes):
+    """
+    Decode a MessagePack body, accepting only values JSON can represent -
+    the payload ends up in task status responses, which are sent as JSON
+    """
+    payload = msgpack.unpackb(body, raw=False)
+    # Iterative walk - a deeply nested body must not hit the recursion limit
+    pending = [payload]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            if not all(isinstance(key, str) for key in value):
+                raise ValueError("MessagePack map keys must be strings")
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif value is not None and not isinstance(value, (str, int, float)):
+            # bytes (bin), ExtType, Timestamp, ...
+            raise ValueError(f"Unsupported MessagePack value type: {type(value).__name__}")
+    return payload
+
+
+def get_webhook_payload():
+    """
+    Parse the webhook request body
+    Accepts JSON or MessagePack (Content-Type: application/msgpack),
+    optionally gzip-compressed (Content-Encoding: gzip)
+    """
+    is_msgpack = request.mimetype == 'application/msgpack'
+    if request.headers.get('Content-Encoding', '').lower() != 'gzip':
+        if is_msgpack:
+            return unpack_msgpack_body(request.get_data())
+        try:
+            return request.get_json()
+        except BadRequest:
+            # Malformed JSON is a client error - ValueError makes it a 400
+            raise ValueError("Invalid JSON body")
+    
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    try:
+        body = decompressor.decompress(request.get_data(), MAX_WEBHOOK_BODY_BYTES)
+    except zlib.error:
+        # Corrupt or not gzip at all - a client error (400), not a server error
+        raise ValueError("Invalid gzip body")
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Decompressed payload exceeds {MAX_WEBHOOK_BODY_BYTES} bytes")
+    if not decompressor.eof:
+        raise ValueError("Invalid gzip body")  # Truncated stream
+    if is_msgpack:
+        return unpack_msgpack_body(body)
+    return json.loads(body)
+
+
+@dataclass(slots=True)
+class WebhookPayload:
+    """Webhook fields, type-checked once when the request arrives"""
+    action: str = "start_automation"
+    task_id: str = None
+    submission_id: str | int = None
+    policy_code: str = None
+    create_account: bool = False
+    quote_data: dict = field(default_factory=dict)
+    account_data: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload) -> "WebhookPayload":
+        """Build from the decoded body; raises ValueError naming the first bad field"""
+        if not isinstance(payload, dict):
+            raise ValueError("Payload must be an object")
+        fields = {}
+        for name, expected in WEBHOOK_FIELD_TYPES.items():
+            value = payload.get(name)
+            if value is None:
+                continue
+            # bool is a subclass of int - don't let true/false pass as an id
+            if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                raise ValueError(f"Invalid {name}: {value!r}")
+            fields[name] = value
+        return cls(**fields)
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip large JSON/HTML responses when the client sends Accept-Encoding: gzip"""
+    if (
+        response.direct_passthrough or response.is_streamed  # Files and event streams are sent as-is
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.mimetype not in COMPRESS_MIMETYPES
+        or 'Content-Encoding' in response.headers
+        or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+    ):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # The compressed body is no longer byte-identical - downgrade to a weak ETag
+    # (If-None-Match is compared weakly, so pollers still get their 304s)
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return jsonify(get_health_info()), 200
+
+
+def get_health_info() -> dict:
+    """Server health and worker/queue counters (shared by /health and /bundle)"""
+    return {
         "status": "healthy",
         "service": "guard-automation",
         "timestamp": datetime.now().isoformat(),
         "active_workers": active_workers,
         "max_workers": MAX_WORKERS,
         "queue_size": task_queue.qsize()
-    }), 200
+    }
 
 
 @app.route(WEBHOOK_PATH, methods=['POST', 'OPTIONS'])
+@app.route(f"{WEBHOOK_PATH}/v2", methods=['POST', 'OPTIONS'])
 def webhook_receiver():
     """
     Main webhook endpoint for Guard automation
+    /webhook/v2 accepts the same payload encoded as MessagePack
     
     Expected payload:
     {
@@ -295,28 +726,36 @@ def webhook_receiver():
         return jsonify({"status": "ok"}), 200
     
     try:
-        # Get JSON payload
-        if not request.is_json:
+        # Get JSON (or MessagePack on /v2) payload
+        if request.path.endswith('/v2'):
+            if request.mimetype != 'application/msgpack':
+                return jsonify({
+                    "status": "error",
+                    "message": "Content-Type must be application/msgpack"
+                }), 400
+        elif not request.is_json:
             return jsonify({
                 "status": "error",
                 "message": "Content-Type must be application/json"
             }), 400
         
-        payload = request.get_json()
+        payload = get_webhook_payload()
         if not payload:
             return jsonify({
                 "status": "error",
                 "message": "No payload received"
             }), 400
         
+        # Type-check once - a malformed payload gets a 400 here, not an error inside a worker
+        webhook = WebhookPayload.from_payload(payload)
         logger.info(f"[GUARD] Webhook request received: {list(payload.keys())}")
         
         # Extract data
-        action = payload.get('action', 'start_automation')
-        policy_code = payload.get('policy_code')
-        quote_data = payload.get('quote_data', {})
-        create_account = payload.get('create_account', False)
-        account_data = payload.get('account_data', {})
+        action = webhook.action
+        policy_code = webhook.policy_code
+        quote_data = webhook.quote_data
+        create_account = webhook.create_account
+        account_data = webhook.account_data
         
         # Validate required fields
         if not create_account and not policy_code:
@@ -326,39 +765,43 @@ def webhook_receiver():
             }), 400
         
         if action == 'start_automation':
+            # One clock read for the generated task_id and queued_at
+            received_at = datetime.now()
+            
             # Generate task_id
             # If submission_id is provided, use format: guard_{submission_id}_{timestamp}
-            submission_id = payload.get('submission_id')
+            submission_id = webhook.submission_id
             if submission_id:
-                task_id = payload.get('task_id') or f"guard_{submission_id}_{int(datetime.now().timestamp())}"
+                task_id = webhook.task_id or f"guard_{submission_id}_{int(received_at.timestamp())}"
             else:
-                task_id = payload.get('task_id') or f"guard_{policy_code or 'new'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                task_id = webhook.task_id or f"guard_{policy_code or 'new'}_{received_at.strftime('%Y%m%d_%H%M%S')}"
             
             logger.info(f"[GUARD] Starting automation task: {task_id}")
             if submission_id:
                 logger.info(f"[GUARD] Submission ID: {submission_id}")
             logger.info(f"[GUARD] Create Account: {create_account}")
             logger.info(f"[GUARD] Policy Code: {policy_code or 'Will be created'}")
-            logger.info(f"[GUARD] Quote Data: {quote_data}")
+            logger.debug("[GUARD] Quote Data: %s", quote_data)
             
             # Check worker availability
-            with worker_lock:
-                current_workers = active_workers
-                queue_size = task_queue.qsize()
+            # Plain reads, no lock: the values only label the new task as queued or
+            # running, and a worker changing them a moment later is harmless
+            current_workers = active_workers
+            queue_size = task_queue.qsize()
             
             # Initialize task status
-            active_sessions[task_id] = {
+            set_task_status(task_id, {
                 "status": "queued" if current_workers >= MAX_WORKERS else "running",
                 "task_id": task_id,
                 "submission_id": submission_id,  # Store submission_id for webhook callback
                 "policy_code": policy_code,
                 "create_account": create_account,
-                "queued_at": datetime.now().isoformat(),
+                "queued_at": received_at.isoformat(),
                 "quote_data": quote_data,
                 "queue_position": queue_size + 1 if current_workers >= MAX_WORKERS else 0,
                 "active_workers": current_workers,
                 "max_workers": MAX_WORKERS
-            }
+            })
             
             # Add to queue
             task_queue.put((task_id, policy_code, quote_data, create_account, account_data))
@@ -381,6 +824,13 @@ def webhook_receiver():
             "message": f"Unknown action: {action}"
         }), 400
         
+    except ValueError as e:
+        # Undecodable body or a field of the wrong type
+        logger.warning(f"[GUARD] Invalid webhook payload: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
     except Exception as e:
         logger.error(f"[GUARD] Webhook error: {e}", exc_info=True)
         return jsonify({
@@ -392,9 +842,32 @@ def webhook_receiver():
 
 @app.route('/task/<task_id>/status', methods=['GET'])
 def get_task_status(task_id: str):
-    """Get status of an automation task"""
-    if task_id in active_sessions:
-        return jsonify(active_sessions[task_id]), 200
+    """
+    Get status of an automation task
+    Responses carry an ETag - pollers sending If-None-Match get an empty 304 while nothing changed
+    The ETag is the task's status version, so an unchanged poll never copies or serializes the status
+    The version is also sent as X-Status-Version; pollers passing it back as
+    ?since=<version> get an empty 204 while it is current
+    """
+    # Read before the snapshot: at worst the ETag is older than the body,
+    # which only costs the poller one extra 200
+    version = task_versions.get(task_id)
+    status = None
+    if version is not None:
+        etag = f"{task_id}-{version}"
+        if request.args.get('since', type=int) == version:
+            return Response(status=204, headers={"X-Status-Version": str(version)})
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304, headers={"X-Status-Version": str(version)})
+            response.set_etag(etag)
+            return response
+        status = get_task_snapshot(task_id)
+    
+    if status is not None:
+        response = jsonify(status)
+        response.set_etag(etag)
+        response.headers["X-Status-Version"] = str(version)
+        return response
     else:
         return jsonify({
             "status": "error",
@@ -402,12 +875,60 @@ def get_task_status(task_id: str):
         }), 404
 
 
+@app.route('/task/<task_id>/events', methods=['GET'])
+def get_task_events(task_id: str):
+    """
+    Stream status changes of an automation task as Server-Sent Events
+    Each event is the full status JSON; the stream ends once the task completes or fails
+    """
+    if task_id not in active_sessions:
+        return jsonify({
+            "status": "error",
+            "message": f"Task {task_id} not found"
+        }), 404
+    
+    def generate():
+        last_event = None
+        last_sent = time.time()
+        seen_version = None
+        while True:
+            # Sleep until any task's status changes (or the heartbeat is due)
+            with status_changed:
+                status_changed.wait_for(lambda: status_version != seen_version, timeout=EVENTS_HEARTBEAT_SECONDS)
+                seen_version = status_version
+                session = active_sessions.get(task_id)
+                if session is None:
+                    break
+                event = json.dumps(session, default=str, ensure_ascii=False, separators=(',', ':'))
+                # Read with the event - session is updated in place, so checking it
+                # after the yield could end the stream before the terminal event is sent
+                terminal = session.get("status") in TERMINAL_STATUSES
+            
+            if event != last_event:
+                yield f"data: {event}\n\n"
+                last_event = event
+                last_sent = time.time()
+            elif time.time() - last_sent >= EVENTS_HEARTBEAT_SECONDS:
+                yield ": heartbeat\n\n"
+                last_sent = time.time()
+            
+            if terminal:
+                break
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.route('/tasks', methods=['GET'])
 def list_tasks():
     """List all tasks"""
+    tasks, total = get_all_task_snapshots(limit=MAX_LISTED_TASKS)
     return jsonify({
-        "tasks": list(active_sessions.values()),
-        "total": len(active_sessions),
+        "tasks": tasks,
+        "total": total,
         "active_workers": active_workers,
         "max_workers": MAX_WORKERS,
         "queue_size": task_queue.qsize()
@@ -421,7 +942,7 @@ def queue_status():
         "queue_size": task_queue.qsize(),
         "active_workers": active_workers,
         "max_workers": MAX_WORKERS,
-        "browser_in_use": browser_in_use
+        "browser_in_use": browser_lock.locked()
     }), 200
 
 
@@ -429,34 +950,33 @@ def queue_status():
 def get_trace(task_id: str):
     """Download trace file for a specific task"""
     try:
-        # Try multiple trace file patterns
+        # Try multiple trace file patterns, in order - the directory is only
+        # globbed if neither fixed name exists
         trace_candidates = [
             TRACE_DIR / f"{task_id}.zip",  # Exact task_id
             TRACE_DIR / f"default.zip",  # Default trace
-            *list(TRACE_DIR.glob(f"*{task_id}*.zip")),  # Any file containing task_id
         ]
-        
-        # Find the first existing trace file
-        trace_path = None
-        for candidate in trace_candidates:
-            if candidate.exists() and candidate.is_file():
-                trace_path = candidate
-                break
+        trace_path = next((c for c in trace_candidates if c.is_file()), None)
+        if trace_path is None:
+            # Any file containing task_id
+            trace_path = next((c for c in TRACE_DIR.glob(f"*{task_id}*.zip") if c.is_file()), None)
         
         if not trace_path:
             logger.warning(f"Trace not found for task: {task_id}")
-            logger.info(f"Searched paths: {[str(p) for p in trace_candidates[:3]]}")
+            logger.info(f"Searched paths: {[str(p) for p in trace_candidates]} and *{task_id}*.zip")
             return jsonify({
                 "status": "not_found",
                 "message": f"Trace not found for task {task_id}"
             }), 404
         
         logger.info(f"Serving trace for task {task_id}: {trace_path}")
+        # conditional: honours Range, If-Modified-Since and If-None-Match (304 / 206)
         return send_file(
             str(trace_path),
             mimetype='application/zip',
             as_attachment=True,
-            download_name=f"{trace_path.name}"
+            download_name=f"{trace_path.name}",
+            conditional=True
         )
     except Exception as e:
         logger.error(f"Error serving trace for task {task_id}: {e}", exc_info=True)
@@ -466,28 +986,8 @@ def get_trace(task_id: str):
         }), 500
 
 
-@app.route('/traces', methods=['GET'])
-def list_traces():
-    """List all available trace files - returns HTML UI or JSON"""
-    try:
-        traces = []
-        for trace_file in sorted(TRACE_DIR.glob("*.zip"), key=lambda f: f.stat().st_mtime, reverse=True):
-            try:
-                stat = trace_file.stat()
-                traces.append({
-                    "task_id": trace_file.stem,
-                    "filename": trace_file.name,
-                    "size_bytes": stat.st_size,
-                    "size_kb": round(stat.st_size / 1024, 2),
-                    "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "url": f"/trace/{trace_file.stem}"
-                })
-            except Exception as e:
-                logger.debug(f"Error getting info for {trace_file}: {e}")
-        
-        # Return HTML if browser request, JSON otherwise
-        if 'text/html' in request.headers.get('Accept', ''):
-            html = '''<!DOCTYPE html>
+# /traces HTML page, compiled once (Flask's Jinja environment, autoescaped)
+TRACES_PAGE = app.jinja_env.from_string('''<!DOCTYPE html>
 <html><head><title>Guard Automation - Traces</title>
 <style>
 body{font-family:'Segoe UI',Arial,sans-serif;max-width:900px;margin:40px auto;padding:0 20px;background:#f5f5f5}
@@ -508,29 +1008,34 @@ a:hover{text-decoration:underline}
 <body>
 <h1>🛡️ Guard Automation - Traces</h1>
 <div class="info">
-<strong>Total:</strong> ''' + str(len(traces)) + ''' traces | <strong>Max stored:</strong> ''' + str(MAX_TRACE_FILES) + '''<br>
-<small>Traces are automatically cleaned up. Only the most recent ''' + str(MAX_TRACE_FILES) + ''' are kept.</small>
-</div>'''
-            
-            if traces:
-                html += '''<table>
-<tr><th>Task ID</th><th>Size</th><th>Created</th><th>Action</th></tr>'''
-                for t in traces:
-                    html += f'''<tr>
-<td><code>{t["task_id"]}</code></td>
-<td class="size">{t["size_kb"]} KB</td>
-<td class="date">{t["created_at"][:19].replace('T', ' ')}</td>
-<td><a href="{t["url"]}" class="download-btn">⬇ Download</a></td>
-</tr>'''
-                html += '</table>'
-            else:
-                html += '<div class="empty">📭 No traces available yet.<br>Run an automation task to generate traces.</div>'
-            
-            html += '''
+<strong>Total:</strong> {{ traces|length }} traces | <strong>Max stored:</strong> {{ max_traces }}<br>
+<small>Traces are automatically cleaned up. Only the most recent {{ max_traces }} are kept.</small>
+</div>
+{%- if traces %}<table>
+<tr><th>Task ID</th><th>Size</th><th>Created</th><th>Action</th></tr>
+{%- for t in traces %}<tr>
+<td><code>{{ t.task_id }}</code></td>
+<td class="size">{{ t.size_kb }} KB</td>
+<td class="date">{{ t.created_at[:19].replace('T', ' ') }}</td>
+<td><a href="{{ t.url }}" class="download-btn">⬇ Download</a></td>
+</tr>{% endfor %}</table>
+{%- else %}<div class="empty">📭 No traces available yet.<br>Run an automation task to generate traces.</div>
+{%- endif %}
 <div style="margin-top:30px;text-align:center;color:#95a5a6;font-size:0.85em">
 Guard Insurance Automation Server | <a href="/health">Health Check</a> | <a href="/tasks">Tasks</a>
 </div>
-</body></html>'''
+</body></html>''')
+
+
+@app.route('/traces', methods=['GET'])
+def list_traces():
+    """List all available trace files - returns HTML UI or JSON"""
+    try:
+        traces = get_trace_infos()
+        
+        # Return HTML if browser request, JSON otherwise
+        if 'text/html' in request.headers.get('Accept', ''):
+            html = TRACES_PAGE.render(traces=traces, max_traces=MAX_TRACE_FILES)
             return html, 200, {'Content-Type': 'text/html'}
         
         return jsonify({
@@ -546,15 +1051,56 @@ Guard Insurance Automation Server | <a href="/health">Health Check</a> | <a href
         }), 500
 
 
-def run_automation_task_sync(task_id: str, policy_code: str, quote_data: dict, create_account: bool = False, account_data: dict = None):
-    """Run automation task synchronously in a thread"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+def invalidate_trace_infos():
+    """Make the next get_trace_infos list TRACE_DIR again (call after traces are written or deleted)"""
+    trace_infos_cache["generation"] += 1
+    trace_infos_cache["at"] = 0.0
+
+
+def get_trace_infos() -> list:
+    """
+    Info for every trace file in TRACE_DIR, newest first (shared by /traces and /bundle)
+    Cached for TRACE_LIST_TTL_SECONDS - callers must not modify the returned list
+    """
+    now = time.monotonic()
+    if now - trace_infos_cache["at"] < TRACE_LIST_TTL_SECONDS:
+        return trace_infos_cache["traces"]
+    generation = trace_infos_cache["generation"]
     
-    try:
-        loop.run_until_complete(run_automation_task(task_id, policy_code, quote_data, create_account, account_data))
-    finally:
-        loop.close()
+    traces = [{
+        "task_id": trace_file.stem,
+        "filename": trace_file.name,
+        "size_bytes": stat.st_size,
+        "size_kb": round(stat.st_size / 1024, 2),
+        "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        "url": f"/trace/{trace_file.stem}"
+    } for trace_file, stat in scan_trace_files()]
+    # Don't cache a listing that was already stale (invalidated while it was built)
+    if trace_infos_cache["generation"] == generation:
+        trace_infos_cache.update(at=now, traces=traces)
+    return traces
+
+
+@app.route('/bundle', methods=['GET'])
+def get_bundle():
+    """
+    Several read endpoints in one response, e.g.
+    /bundle?task_id=<id>&include=status,traces,health
+    
+    Returns {"status": {...} or null, "traces": [...], "health": {...}} with only
+    the requested keys - one round-trip instead of one per endpoint
+    """
+    include = set(request.args.get('include', 'status').split(','))
+    bundle = {}
+    
+    if 'status' in include:
+        bundle["status"] = get_task_snapshot(request.args.get('task_id'))
+    if 'traces' in include:
+        bundle["traces"] = get_trace_infos()
+    if 'health' in include:
+        bundle["health"] = get_health_info()
+    
+    return jsonify(bundle), 200
 
 
 async def run_automation_task(task_id: str, policy_code: str, quote_data: dict, create_account: bool = False, account_data: dict = None):
@@ -562,16 +1108,22 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
     logger.info(f"[TASK {task_id}] Starting Guard automation")
     logger.info(f"[TASK {task_id}] Create Account: {create_account}")
     logger.info(f"[TASK {task_id}] Policy Code: {policy_code or 'Will be created'}")
-    logger.info(f"[TASK {task_id}] Quote Data: {json.dumps(quote_data, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[TASK %s] Quote Data: %s", task_id, json.dumps(quote_data, indent=2))
     
     login_handler = None
     trace_id = None
     
+    # submission_id is set when the task is created and never changes - read it
+    # once for every Coversheet notification below
+    session = get_task_snapshot(task_id)
+    submission_id = session.get('submission_id') if session else None
+    
     # Create trace_id from company name if account_data is provided
     if account_data and account_data.get('applicant_name'):
         company_name = account_data.get('applicant_name', '')
         # Sanitize company name for filename (remove special chars, limit length)
-        safe_company = "".join(c if c.isalnum() else "_" for c in company_name)[:30].lower()
+        safe_company = safe_trace_name(company_name)
         trace_id = safe_company
         logger.info(f"[TASK {task_id}] Trace ID: {trace_id}")
     elif policy_code:
@@ -588,46 +1140,29 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
             # ==================================================================
             # APPLY HARDCODED DEFAULTS FOR ACCOUNT DATA
             # ==================================================================
-            from datetime import timedelta
-            policy_inception_date = (datetime.now() + timedelta(days=2)).strftime("%m/%d/%Y")
+            policy_inception_date = _policy_inception(date.today().toordinal())
             
             # Default account data (used if nothing provided)
             if not account_data:
-                account_data = {
-                    "legal_entity": "L",
-                    "applicant_name": "TEST COMPANY LLC",
-                    "dba": "",
-                    "address1": "280 Griffin St",
-                    "address2": "",
-                    "zipcode": "30253-3100",
-                    "city": "McDonough",
-                    "state": "GA",
-                    "contact_name": "John Doe",
-                    "contact_phone": {"area": "404", "prefix": "555", "suffix": "9999"},
-                    "email": "test@example.com",
-                    "years_in_business": "5",
-                    "ownership_type": "tenant"
-                }
+                account_data = DEFAULT_ACCOUNT_DATA
                 logger.info(f"[TASK {task_id}] Using default account data")
             
-            # Apply HARDCODED values (user doesn't need to send these)
-            account_data["website"] = ""  # Hardcoded
+            # Apply HARDCODED values (user doesn't need to send these) in one
+            # new dict - the request's account_data is left untouched
             # NOTE: description is sent by user (mandatory field)
-            account_data["producer_id"] = "2774846"  # Hardcoded
-            account_data["csr_id"] = "16977940"  # Hardcoded
-            account_data["policy_inception"] = policy_inception_date  # Auto-calculated
+            account_data = {
+                **account_data,
+                **HARDCODED_ACCOUNT_FIELDS,
+                "policy_inception": policy_inception_date,  # Auto-calculated
+            }
             account_data["headquarters_state"] = account_data.get("state", "GA")  # Copy from state
-            account_data["industry_id"] = "11"  # Hardcoded (Gas Station)
-            account_data["sub_industry_id"] = "45"  # Hardcoded
-            account_data["business_type_id"] = "127"  # Hardcoded
-            account_data["lines_of_business"] = ["CB"]  # Hardcoded (Commercial Business)
             
             logger.info(f"[TASK {task_id}] Applied hardcoded defaults to account data")
             
             # Update trace_id with company name if not already set
             if not trace_id and account_data.get('applicant_name'):
                 company_name = account_data.get('applicant_name', '')
-                safe_company = "".join(c if c.isalnum() else "_" for c in company_name)[:30].lower()
+                safe_company = safe_trace_name(company_name)
                 trace_id = safe_company
                 # Update login_handler with new trace_id
                 login_handler.trace_id = trace_id
@@ -641,16 +1176,13 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
             
             if not login_result.get("success"):
                 logger.error(f"[TASK {task_id}] Login failed")
-                active_sessions[task_id] = {
-                    "status": "failed",
-                    "task_id": task_id,
-                    "error": "Login failed",
-                    "failed_at": datetime.now().isoformat()
-                }
+                update_task_status(
+                    task_id,
+                    status="failed",
+                    error="Login failed",
+                    failed_at=datetime.now().isoformat()
+                )
                 # Notify Coversheet of failure
-                submission_id = None
-                if task_id in active_sessions:
-                    submission_id = active_sessions[task_id].get('submission_id')
                 notify_coversheet_completion(
                     task_id=task_id,
                     submission_id=submission_id,
@@ -661,21 +1193,18 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
                 return
             
             # Create account
+            # Browser stays open - the quote below runs in it
             account_result = await login_handler.setup_account(account_data)
-            await login_handler.close()
             
             if not account_result.get("success"):
                 logger.error(f"[TASK {task_id}] Account creation failed")
-                active_sessions[task_id] = {
-                    "status": "failed",
-                    "task_id": task_id,
-                    "error": "Account creation failed",
-                    "failed_at": datetime.now().isoformat()
-                }
+                update_task_status(
+                    task_id,
+                    status="failed",
+                    error="Account creation failed",
+                    failed_at=datetime.now().isoformat()
+                )
                 # Notify Coversheet of failure
-                submission_id = None
-                if task_id in active_sessions:
-                    submission_id = active_sessions[task_id].get('submission_id')
                 notify_coversheet_completion(
                     task_id=task_id,
                     submission_id=submission_id,
@@ -692,8 +1221,7 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
             logger.info(f"[TASK {task_id}] Quotation URL: {quotation_url}")
             
             # Update session with new policy code
-            active_sessions[task_id]["policy_code"] = policy_code
-            active_sessions[task_id]["quotation_url"] = quotation_url
+            update_task_status(task_id, policy_code=policy_code, quotation_url=quotation_url)
             
             # After account creation, run quote automation directly (already logged in)
             logger.info(f"[TASK {task_id}] Running quote automation...")
@@ -701,70 +1229,60 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
             # Import here to avoid circular imports
             from guard_quote import GuardQuote
             
-            # Extract quote data with defaults
-            quote_params = {
-                "combined_sales": quote_data.get("combined_sales", "1000000") if quote_data else "1000000",
-                "gas_gallons": quote_data.get("gas_gallons", "100000") if quote_data else "100000",
-                "year_built": quote_data.get("year_built", "2025") if quote_data else "2025",
-                "square_footage": quote_data.get("square_footage", "2000") if quote_data else "2000",
-                "mpds": quote_data.get("mpds", "6") if quote_data else "6",
-                "employees": quote_data.get("employees", "3") if quote_data else "3"  # Default to 3 if not provided
-            }
+            # Extract quote data with defaults (quote_data is always a dict - see WebhookPayload)
+            quote_params = {key: quote_data.get(key, default) for key, default in DEFAULT_QUOTE_PARAMS.items()}
             
-            # Initialize quote handler with same task_id for session sharing
+            # Quote handler reuses the logged-in browser - no second Chromium launch
             # Use quote_{trace_id} for quote trace file
             quote_trace_id = f"quote_{trace_id}" if trace_id else f"quote_{policy_code.lower()}"
             quote_handler = GuardQuote(
                 policy_code=policy_code,
                 task_id="default",  # Share session
                 trace_id=quote_trace_id,
+                login_handler=login_handler,
                 **quote_params
             )
             
             try:
-                # Initialize browser (session already exists)
+                # Attach to the open browser (starts the quote trace file)
                 await quote_handler.init_browser()
                 
                 # Login (should use existing session)
                 if not await quote_handler.login():
                     logger.error(f"[TASK {task_id}] Quote login failed")
-                    active_sessions[task_id] = {
-                        "status": "failed",
-                        "task_id": task_id,
-                        "error": "Quote login failed",
-                        "failed_at": datetime.now().isoformat()
-                    }
+                    update_task_status(
+                        task_id,
+                        status="failed",
+                        error="Quote login failed",
+                        failed_at=datetime.now().isoformat()
+                    )
                     return
                 
                 # Navigate to quote URL
                 if not await quote_handler.navigate_to_quote():
                     logger.error(f"[TASK {task_id}] Navigation to quote page failed")
-                    active_sessions[task_id] = {
-                        "status": "failed",
-                        "task_id": task_id,
-                        "error": "Navigation to quote page failed",
-                        "failed_at": datetime.now().isoformat()
-                    }
+                    update_task_status(
+                        task_id,
+                        status="failed",
+                        error="Navigation to quote page failed",
+                        failed_at=datetime.now().isoformat()
+                    )
                     return
                 
                 # Fill quote details
                 await quote_handler.fill_quote_details()
                 
                 logger.info(f"[TASK {task_id}] ✅ Quote automation completed for policy {policy_code}")
-                active_sessions[task_id] = {
-                    "status": "completed",
-                    "task_id": task_id,
-                    "policy_code": policy_code,
-                    "completed_at": datetime.now().isoformat(),
-                    "message": f"Quote automation completed successfully for policy {policy_code}",
-                    "quotation_url": quotation_url
-                }
+                update_task_status(
+                    task_id,
+                    status="completed",
+                    policy_code=policy_code,
+                    completed_at=datetime.now().isoformat(),
+                    message=f"Quote automation completed successfully for policy {policy_code}",
+                    quotation_url=quotation_url
+                )
                 
                 # Notify Coversheet of successful completion (account + quote)
-                submission_id = None
-                if task_id in active_sessions:
-                    submission_id = active_sessions[task_id].get('submission_id')
-                
                 notify_coversheet_completion(
                     task_id=task_id,
                     submission_id=submission_id,
@@ -777,22 +1295,18 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
                 )
                 
             except Exception as e:
-                import traceback
-                error_details = traceback.format_exc()
+                # Formatted once - reused for the log and the Coversheet payload
+                error_details = traceback.format_exc()[-MAX_TRACEBACK_CHARS:]
                 error_message = f"Quote automation error: {str(e)}"
-                logger.error(f"[TASK {task_id}] ❌ Quote automation error: {e}", exc_info=True)
-                active_sessions[task_id] = {
-                    "status": "failed",
-                    "task_id": task_id,
-                    "error": error_message,
-                    "failed_at": datetime.now().isoformat()
-                }
+                logger.error(f"[TASK {task_id}] ❌ Quote automation error: {e}\n{error_details}")
+                update_task_status(
+                    task_id,
+                    status="failed",
+                    error=error_message,
+                    failed_at=datetime.now().isoformat()
+                )
                 
                 # Notify Coversheet of failure
-                submission_id = None
-                if task_id in active_sessions:
-                    submission_id = active_sessions[task_id].get('submission_id')
-                
                 notify_coversheet_completion(
                     task_id=task_id,
                     submission_id=submission_id,
@@ -818,21 +1332,16 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
         if automation_result.get("success"):
             logger.info(f"[TASK {task_id}] ✅ SUCCESS! {automation_result.get('message')}")
             
-            active_sessions[task_id] = {
-                "status": "completed",
-                "task_id": task_id,
-                "policy_code": policy_code,
-                "completed_at": datetime.now().isoformat(),
-                "message": automation_result.get("message"),
-                "result": automation_result
-            }
+            update_task_status(
+                task_id,
+                status="completed",
+                policy_code=policy_code,
+                completed_at=datetime.now().isoformat(),
+                message=automation_result.get("message"),
+                result=automation_result
+            )
             
             # Notify Coversheet of successful completion
-            # Get submission_id from active_sessions if stored, otherwise extract from task_id
-            submission_id = None
-            if task_id in active_sessions:
-                submission_id = active_sessions[task_id].get('submission_id')
-            
             notify_coversheet_completion(
                 task_id=task_id,
                 submission_id=submission_id,
@@ -845,19 +1354,15 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
             )
         else:
             logger.error(f"[TASK {task_id}] ❌ Failed: {automation_result.get('message')}")
-            active_sessions[task_id] = {
-                "status": "failed",
-                "task_id": task_id,
-                "policy_code": policy_code,
-                "error": automation_result.get("message"),
-                "failed_at": datetime.now().isoformat()
-            }
+            update_task_status(
+                task_id,
+                status="failed",
+                policy_code=policy_code,
+                error=automation_result.get("message"),
+                failed_at=datetime.now().isoformat()
+            )
             
             # Notify Coversheet of failure
-            submission_id = None
-            if task_id in active_sessions:
-                submission_id = active_sessions[task_id].get('submission_id')
-            
             notify_coversheet_completion(
                 task_id=task_id,
                 submission_id=submission_id,
@@ -867,26 +1372,22 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
             )
     
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
+        # Formatted once - reused for the log, the task status and the Coversheet payload
+        error_details = traceback.format_exc()[-MAX_TRACEBACK_CHARS:]
         error_message = str(e)
         logger.error(f"[TASK {task_id}] ❌ Error: {e}")
         logger.error(f"[TASK {task_id}] Full traceback:\n{error_details}")
-        active_sessions[task_id] = {
-            "status": "error",
-            "task_id": task_id,
-            "policy_code": policy_code,
-            "error": error_message,
-            "error_type": type(e).__name__,
-            "traceback": error_details,
-            "failed_at": datetime.now().isoformat()
-        }
+        update_task_status(
+            task_id,
+            status="error",
+            policy_code=policy_code,
+            error=error_message,
+            error_type=type(e).__name__,
+            traceback=error_details,
+            failed_at=datetime.now().isoformat()
+        )
         
         # Notify Coversheet of error
-        submission_id = None
-        if task_id in active_sessions:
-            submission_id = active_sessions[task_id].get('submission_id')
-        
         notify_coversheet_completion(
             task_id=task_id,
             submission_id=submission_id,
@@ -896,81 +1397,101 @@ async def run_automation_task(task_id: str, policy_code: str, quote_data: dict,
         )
     finally:
         if login_handler:
-            try:
+            # Already closed on the create-account path (quote_handler shares it);
+            # close() is idempotent. Errors here must not mask the task's result.
+            with suppress(Exception):
                 await login_handler.close()
-            except:
-                pass
 
 
 def worker_thread():
     """Worker thread that processes tasks from the queue"""
-    global active_workers, browser_in_use
+    global active_workers
     
-    while True:
-        try:
-            # Get task from queue (blocks until task available)
-            task = task_queue.get(timeout=1)
-            task_id, policy_code, quote_data, create_account, account_data = task
-            
-            # Update status to "waiting_for_browser"
-            if task_id in active_sessions:
-                active_sessions[task_id]["status"] = "waiting_for_browser"
-                active_sessions[task_id]["picked_at"] = datetime.now().isoformat()
-            
-            # Acquire browser lock
-            logger.info(f"[QUEUE] Task {task_id} waiting for browser lock...")
-            browser_lock.acquire()
-            browser_in_use = True
-            
-            # Increment active workers
-            with worker_lock:
-                active_workers += 1
-                logger.info(f"[QUEUE] Task {task_id} acquired browser lock. Active: {active_workers}/{MAX_WORKERS}")
-            
+    # One event loop for the worker's whole life - tasks reuse it instead of
+    # creating and tearing down a loop each
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    
+    try:
+        while True:
             try:
-                # Update task status to running
-                if task_id in active_sessions:
-                    active_sessions[task_id]["status"] = "running"
-                    active_sessions[task_id]["queue_position"] = 0
-                    active_sessions[task_id]["started_at"] = datetime.now().isoformat()
+                # Get task from queue (blocks until a task - or the shutdown sentinel - arrives)
+                task = task_queue.get()
+                if task is None:
+                    task_queue.task_done()
+                    logger.info(f"[QUEUE] {threading.current_thread().name} stopping")
+                    return
+                task_id, policy_code, quote_data, create_account, account_data = task
                 
-                # Remove from queue position tracking
-                if task_id in queue_position:
-                    del queue_position[task_id]
+                # Update status to "waiting_for_browser"
+                update_task_status(task_id, status="waiting_for_browser", picked_at=datetime.now().isoformat())
                 
-                logger.info(f"[QUEUE] Processing task {task_id}")
+                # Acquire browser lock
+                logger.info(f"[QUEUE] Task {task_id} waiting for browser lock...")
+                browser_lock.acquire()
                 
-                # Run automation
-                run_automation_task_sync(task_id, policy_code, quote_data, create_account, account_data)
+                # Increment active workers (browser_lock is held, so no other worker is updating it)
+                active_workers += 1
+                logger.info(f"[QUEUE] Task {task_id} acquired browser lock. Active: {active_workers}/{MAX_WORKERS}")
                 
-            except Exception as e:
-                logger.error(f"[QUEUE] Error processing task {task_id}: {e}", exc_info=True)
-                if task_id in active_sessions:
-                    active_sessions[task_id]["status"] = "error"
-                    active_sessions[task_id]["error"] = str(e)
-            finally:
-                # Decrement active workers
-                with worker_lock:
+                try:
+                    # Update task status to running
+                    update_task_status(task_id, status="running", queue_position=0, started_at=datetime.now().isoformat())
+                    
+                    logger.info(f"[QUEUE] Processing task {task_id}")
+                    
+                    # Run automation
+                    loop.run_until_complete(run_automation_task(task_id, policy_code, quote_data, create_account, account_data))
+                    
+                except Exception as e:
+                    logger.error(f"[QUEUE] Error processing task {task_id}: {e}", exc_info=True)
+                    update_task_status(task_id, status="error", error=str(e))
+                finally:
+                    # Decrement active workers (before releasing browser_lock)
                     active_workers -= 1
                     logger.info(f"[QUEUE] Task {task_id} finished. Active: {active_workers}/{MAX_WORKERS}")
-                
-                # Release browser lock
-                browser_in_use = False
-                browser_lock.release()
-                logger.info(f"[QUEUE] Task {task_id} released browser lock")
-                
-                # Mark task as done
-                task_queue.task_done()
-                
-        except queue.Empty:
-            continue
-        except Exception as e:
-            logger.error(f"[QUEUE] Worker thread error: {e}", exc_info=True)
+                    
+                    # The task may have saved trace files
+                    invalidate_trace_infos()
+                    
+                    # Release browser lock
+                    browser_lock.release()
+                    logger.info(f"[QUEUE] Task {task_id} released browser lock")
+                    
+                    # Mark task as done
+                    task_queue.task_done()
+                    
+            except Exception as e:
+                logger.error(f"[QUEUE] Worker thread error: {e}", exc_info=True)
+    finally:
+        loop.close()
+
+
+def stop_workers():
+    """
+    Let idle worker threads and the cleanup scheduler exit, and give queued
+    Coversheet notifications a chance to be sent (registered with atexit)
+    """
+    cleanup_stop_event.set()
+    for _ in range(MAX_WORKERS):
+        task_queue.put(None)  # One shutdown sentinel per worker
+    notify_queue.put(None)
+    if notifier_thread is not None:
+        notifier_thread.join(timeout=NOTIFY_FLUSH_TIMEOUT_SECONDS)
 
 
 def init_workers():
-    """Initialize worker threads and cleanup scheduler"""
-    global cleanup_thread
+    """
+    Initialize worker threads and cleanup scheduler
+    Called once per server process - from gunicorn's post_worker_init hook
+    (gunicorn_conf.py) or before app.run() below; later calls do nothing
+    """
+    global cleanup_thread, notifier_thread, workers_started
+    
+    with workers_started_lock:
+        if workers_started:
+            return
+        workers_started = True
     
     logger.info("=" * 80)
     logger.info("GUARD AUTOMATION WEBHOOK SERVER v2.0.0")
@@ -992,6 +1513,13 @@ def init_workers():
     cleanup_thread.start()
     logger.info("  Cleanup scheduler started")
     
+    # Start Coversheet notification thread
+    notifier_thread = threading.Thread(target=notifier_loop, daemon=True, name="Coversheet-Notifier")
+    notifier_thread.start()
+    logger.info("  Coversheet notifier started")
+    
+    atexit.register(stop_workers)
+    
     # Run initial cleanup on startup
     logger.info("  Running initial cleanup...")
     cleanup_old_files()
@@ -1001,9 +1529,6 @@ def init_workers():
     logger.info("=" * 80)
 
 
-# Initialize workers when module loads
-init_workers()
-
 if __name__ == '__main__':
     logger.info(f"Starting Guard webhook server on {WEBHOOK_HOST}:{WEBHOOK_PORT}")
     logger.info(f"Webhook endpoint: http://{WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}")
@@ -1012,4 +1537,6 @@ if __name__ == '__main__':
     logger.info(f"Traces: http://{WEBHOOK_HOST}:{WEBHOOK_PORT}/traces")
     logger.info(f"Logs directory: {LOG_DIR}")
     
+    # Development server - production runs `gunicorn -c gunicorn_conf.py webhook_server:app`
+    init_workers()
     app.run(host=WEBHOOK_HOST, port=WEBHOOK_PORT, debug=False)